@@ -0,0 +1,332 @@
+"""
+Ajuste de parâmetros (beta, porcentagem_ch, algoritmo) por successive halving.
+Todas as configurações começam com um orçamento pequeno de rodadas; a cada etapa
+o orçamento cresce, as configurações ativas com pior pontuação são descartadas e
+as demais continuam, a partir do vetor de baterias salvo, até o número máximo de
+rodadas. Configurações que já terminaram guardam o resultado final e não
+consomem mais rodadas.
+
+Nas instâncias fornecidas, motes vivos e bateria restante nas primeiras
+centenas de rodadas não predizem a duração final (o Prim mantém mais motes
+vivos e termina antes; configurações do Kruskal ficam empatadas até as últimas
+rodadas). Por isso o critério padrão ordena só pelas rodadas alcançadas e
+empates nunca são descartados: o vencedor é o mesmo da grade completa, e a
+economia vem apenas de critérios mais informativos passados em criterio
+(ver verificar_contra_grade).
+"""
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from . import compartilhado
+from . import motor
+from .node import MAX_BATERIA
+
+
+def grade_configuracoes(betas=(0.3, 0.5, 0.7), porcentagens=(0.05, 0.1, 0.2), algoritmos=("kruskal", "prim"),
+                        usar_cluster_heads=(True, False)):
+    """
+    Gera a grade de configurações a avaliar.
+
+    Sem cluster heads a porcentagem não tem efeito, então cada beta/algoritmo
+    aparece uma única vez nesse modo.
+
+    :return: Lista de dicionários com algoritmo, beta, porcentagem_ch e usar_cluster_heads
+    """
+    configuracoes = []
+    for algoritmo in algoritmos:
+        for usar_ch in usar_cluster_heads:
+            for beta in betas:
+                for porcentagem_ch in (porcentagens if usar_ch else porcentagens[:1]):
+                    configuracoes.append({
+                        "algoritmo": algoritmo,
+                        "beta": beta,
+                        "porcentagem_ch": porcentagem_ch,
+                        "usar_cluster_heads": usar_ch,
+                    })
+    return configuracoes
+
+
+def _avancar(topologia, tarefa):
+    """
+    Continua uma configuração da rodada salva até o orçamento da etapa.
+
+    :param topologia: Topologia da rede
+    :param tarefa: Tupla (índice, configuração, baterias, rodadas executadas, orçamento)
+    :return: Tupla (índice, baterias, rodadas executadas, terminou)
+    """
+    indice, config, baterias, executadas, orcamento = tarefa
+    terminou = False
+    for rodada, _, tree, motes_ativos in motor.iterar_rodadas(topologia, baterias, config["algoritmo"], orcamento,
+                                                             config["beta"], config["porcentagem_ch"],
+                                                             config["usar_cluster_heads"], executadas + 1):
+        executadas = rodada
+        terminou = motes_ativos == 0 or len(tree) == 0
+    return indice, baterias, executadas, terminou
+
+
+def _avancar_no_processo(tarefa):
+    """Versão para os processos de trabalho, sobre a geometria compartilhada."""
+    return _avancar(compartilhado.topologia_processo(), tarefa)
+
+
+def _sondar_primeira_morte(topologia, config, baterias, rodadas):
+    """
+    Simula uma configuração até a morte do primeiro mote, para derivar o orçamento inicial.
+
+    :return: Tupla (rodadas executadas, terminou)
+    """
+    total_motes = topologia.n - 1
+    executadas = 0
+    terminou = False
+    for rodada, _, tree, motes_ativos in motor.iterar_rodadas(topologia, baterias, config["algoritmo"], rodadas,
+                                                             config["beta"], config["porcentagem_ch"],
+                                                             config["usar_cluster_heads"]):
+        executadas = rodada
+        terminou = motes_ativos == 0 or len(tree) == 0
+        if motes_ativos < total_motes:
+            break
+    return executadas, terminou
+
+
+def pontuacao_padrao(rodadas, motes_ativos, bateria):
+    """
+    Critério padrão de ordenação (maior é melhor): apenas as rodadas alcançadas.
+
+    Configurações que já terminaram ficam atrás das ativas, e as ativas empatam
+    entre si (motes vivos e bateria restante não são usados porque, nas
+    instâncias fornecidas, ordenam as configurações ao contrário da duração final).
+    """
+    return rodadas
+
+
+def _medidas(estado, n):
+    """Rodadas executadas, motes vivos e bateria restante de uma configuração."""
+    baterias = estado["baterias"]
+    motes_ativos = sum(1 for i in range(1, n) if baterias[i] > 0)
+    bateria = sum(baterias[i] for i in range(1, n))
+    return estado["rodadas"], motes_ativos, bateria
+
+
+def ajustar_parametros(nodes, configuracoes=None, rodadas=2000, orcamento_inicial=None, fator=2, fracao_descarte=0.5,
+                       processos=1, topologia=None, criterio=pontuacao_padrao, verbose=False):
+    """
+    Procura a melhor configuração com successive halving.
+
+    Os orçamentos são orcamento_inicial, orcamento_inicial * fator, ... até
+    rodadas. Sem orcamento_inicial, a primeira configuração é simulada até a
+    morte do primeiro mote e essa rodada vira o orçamento inicial (o estado da
+    sonda é aproveitado). Ao fim de cada etapa (menos a última) a fração
+    fracao_descarte das configurações ainda ativas é eliminada: configurações
+    que já terminaram não entram na contagem nem são descartadas, e
+    configurações empatadas com a última mantida continuam todas.
+
+    Com o critério padrão as configurações ativas empatam (ver
+    pontuacao_padrao), então o vencedor é sempre o da grade completa.
+    verificar_contra_grade mede a economia e a concordância de outro critério.
+
+    :param nodes: Lista de nós da rede
+    :param configuracoes: Lista não vazia de configurações (padrão: grade_configuracoes())
+    :param rodadas: Número máximo de rodadas
+    :param orcamento_inicial: Rodadas da primeira etapa (padrão: rodada da primeira morte)
+    :param fator: Multiplicador do orçamento entre etapas (maior que 1)
+    :param fracao_descarte: Fração das configurações ativas descartada a cada etapa, em [0, 1)
+    :param processos: Número de processos de trabalho (1 executa no processo atual)
+    :param topologia: Topologia pré-calculada (opcional)
+    :param criterio: Função (rodadas, motes_ativos, bateria) -> chave de ordenação, maior é melhor
+    :param verbose: Se True, imprime o resumo de cada etapa
+    :return: Dicionário com melhor configuração, resultado, auditoria e rodadas simuladas
+    """
+    if configuracoes is None:
+        configuracoes = grade_configuracoes()
+    if not configuracoes:
+        raise ValueError("configuracoes deve ter pelo menos uma configuração")
+    if rodadas < 1:
+        raise ValueError(f"rodadas deve ser pelo menos 1: {rodadas}")
+    if orcamento_inicial is not None and orcamento_inicial < 1:
+        raise ValueError(f"orcamento_inicial deve ser pelo menos 1: {orcamento_inicial}")
+    if fator <= 1:
+        raise ValueError(f"fator deve ser maior que 1: {fator}")
+    if not 0 <= fracao_descarte < 1:
+        raise ValueError(f"fracao_descarte deve estar em [0, 1): {fracao_descarte}")
+    if processos < 1:
+        raise ValueError(f"processos deve ser pelo menos 1: {processos}")
+
+    if topologia is None:
+        topologia = motor.construir_topologia(nodes)
+    n = topologia.n
+
+    estados = [{"rodadas": 0, "terminou": False, "baterias": array("d", [MAX_BATERIA]) * n}
+               for _ in configuracoes]
+    ativas = list(range(len(configuracoes)))
+    rodadas_simuladas = 0
+
+    if orcamento_inicial is None:
+        executadas, terminou = _sondar_primeira_morte(topologia, configuracoes[0], estados[0]["baterias"], rodadas)
+        estados[0].update({"rodadas": executadas, "terminou": terminou or executadas >= rodadas})
+        rodadas_simuladas += executadas
+        orcamento_inicial = max(1, executadas)
+
+    orcamentos = []
+    orcamento = min(orcamento_inicial, rodadas)
+    while orcamento < rodadas:
+        orcamentos.append(orcamento)
+        orcamento = max(orcamento + 1, int(orcamento * fator))
+    orcamentos.append(rodadas)
+
+    auditoria = []
+
+    geometria = None
+    executor = None
+    if processos > 1:
+        geometria = compartilhado.GeometriaCompartilhada(topologia)
+        executor = ProcessPoolExecutor(max_workers=processos, initializer=compartilhado.inicializar_processo,
+                                       initargs=(geometria.descritor,))
+
+    try:
+        for etapa, orcamento in enumerate(orcamentos):
+            tarefas = [(i, configuracoes[i], estados[i]["baterias"], estados[i]["rodadas"], orcamento)
+                       for i in ativas if not estados[i]["terminou"] and estados[i]["rodadas"] < orcamento]
+
+            if executor is not None:
+                concluidas = executor.map(_avancar_no_processo, tarefas)
+            else:
+                concluidas = (_avancar(topologia, tarefa) for tarefa in tarefas)
+
+            for indice, baterias, executadas, terminou in concluidas:
+                rodadas_simuladas += executadas - estados[indice]["rodadas"]
+                estados[indice].update({"rodadas": executadas, "terminou": terminou or executadas >= rodadas,
+                                        "baterias": baterias})
+
+            # Ordena da melhor para a pior; empates mantêm a ordem original
+            pontuacoes = {i: _medidas(estados[i], n) for i in ativas}
+            chaves = {i: criterio(*pontuacoes[i]) for i in ativas}
+            ordenadas = sorted(ativas, key=chaves.get, reverse=True)
+
+            # Só as configurações ativas disputam as vagas; as concluídas já não custam nada
+            descartadas = set()
+            vivas = [i for i in ordenadas if not estados[i]["terminou"]]
+            if etapa < len(orcamentos) - 1 and vivas:
+                vagas = max(1, len(vivas) - int(len(vivas) * fracao_descarte))
+                corte = chaves[vivas[vagas - 1]]
+                descartadas = {i for i in vivas if chaves[i] < corte}
+
+            for posicao, i in enumerate(ordenadas):
+                executadas, motes_ativos, bateria = pontuacoes[i]
+                auditoria.append({
+                    "etapa": etapa,
+                    "orcamento": orcamento,
+                    "configuracao": dict(configuracoes[i]),
+                    "rodadas": executadas,
+                    "motes_ativos": motes_ativos,
+                    "bateria": bateria,
+                    "terminou": estados[i]["terminou"],
+                    "posicao": posicao + 1,
+                    "mantida": i not in descartadas,
+                })
+
+            ativas = [i for i in ordenadas if i not in descartadas]
+
+            if verbose:
+                melhor = configuracoes[ordenadas[0]]
+                print(f"Etapa {etapa + 1}: orçamento {orcamento:>5} rodadas, {len(ordenadas):>3} configurações, "
+                      f"{len(ativas):>3} mantidas | melhor: {melhor['algoritmo']} beta={melhor['beta']} "
+                      f"ch={melhor['porcentagem_ch'] if melhor['usar_cluster_heads'] else '-'} "
+                      f"({pontuacoes[ordenadas[0]][0]} rodadas, {pontuacoes[ordenadas[0]][1]} motes)")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+            geometria.fechar()
+
+    melhor = ativas[0]
+    executadas, motes_ativos, bateria = _medidas(estados[melhor], n)
+    return {
+        "melhor": dict(configuracoes[melhor]),
+        "resultado": {"rodadas": executadas, "motes_ativos": motes_ativos, "bateria_final": bateria},
+        "auditoria": auditoria,
+        "rodadas_simuladas": rodadas_simuladas,
+    }
+
+
+def verificar_contra_grade(nodes, configuracoes=None, rodadas=2000, topologia=None, **opcoes):
+    """
+    Compara ajustar_parametros com a simulação completa de todas as configurações.
+
+    :param nodes: Lista de nós da rede
+    :param configuracoes: Lista de configurações (padrão: grade_configuracoes())
+    :param rodadas: Número máximo de rodadas
+    :param topologia: Topologia pré-calculada (opcional)
+    :param opcoes: Demais parâmetros de ajustar_parametros (orcamento_inicial, fator, criterio, ...)
+    :return: Dicionário com rodadas da grade e do ajuste, economia, melhor de cada um e se coincidem
+    """
+    if configuracoes is None:
+        configuracoes = grade_configuracoes()
+    if topologia is None:
+        topologia = motor.construir_topologia(nodes)
+
+    duracoes = []
+    for config in configuracoes:
+        baterias = array("d", [MAX_BATERIA]) * topologia.n
+        duracoes.append(motor.simular_descarga(topologia, baterias, config["algoritmo"], rodadas, config["beta"],
+                                               config["porcentagem_ch"], config["usar_cluster_heads"]))
+    rodadas_grade = sum(duracoes)
+    melhor_grade = max(range(len(configuracoes)), key=duracoes.__getitem__)
+
+    ajuste = ajustar_parametros(nodes, configuracoes, rodadas, topologia=topologia, **opcoes)
+    return {
+        "rodadas_grade": rodadas_grade,
+        "rodadas_ajuste": ajuste["rodadas_simuladas"],
+        "economia": 1 - ajuste["rodadas_simuladas"] / rodadas_grade,
+        "melhor_grade": dict(configuracoes[melhor_grade]),
+        "duracao_grade": duracoes[melhor_grade],
+        "melhor_ajuste": ajuste["melhor"],
+        "duracao_ajuste": ajuste["resultado"]["rodadas"],
+        "coincide": ajuste["resultado"]["rodadas"] == duracoes[melhor_grade],
+    }
+
+
+def exibir_auditoria(ajuste):
+    """
+    Exibe o log de auditoria de ajustar_parametros, etapa por etapa.
+
+    :param ajuste: Dicionário retornado por ajustar_parametros
+    """
+    print("\n" + "=" * 90)
+    print("AUDITORIA DO AJUSTE (SUCCESSIVE HALVING)")
+    print("=" * 90)
+    print(f"{'Etapa':>5} {'Orçam.':>6} {'Pos.':>4} {'Algoritmo':<9} {'Beta':>5} {'CH':>5} "
+          f"{'Rodadas':>8} {'Motes':>6} {'Bateria':>10}  Situação")
+    print("-" * 90)
+    for registro in ajuste["auditoria"]:
+        config = registro["configuracao"]
+        ch = f"{config['porcentagem_ch']:.2f}" if config["usar_cluster_heads"] else "-"
+        if not registro["mantida"]:
+            situacao = "descartada"
+        elif registro["terminou"]:
+            situacao = "concluída"
+        else:
+            situacao = "continua"
+        print(f"{registro['etapa'] + 1:>5} {registro['orcamento']:>6} {registro['posicao']:>4} {config['algoritmo']:<9} "
+              f"{config['beta']:>5} {ch:>5} {registro['rodadas']:>8} {registro['motes_ativos']:>6} "
+              f"{registro['bateria']:>10.2f}  {situacao}")
+    print("-" * 90)
+    melhor = ajuste["melhor"]
+    resultado = ajuste["resultado"]
+    print(f"Melhor: {melhor} -> {resultado['rodadas']} rodadas, {resultado['motes_ativos']} motes ativos, "
+          f"bateria {resultado['bateria_final']:.2f}")
+    print(f"Rodadas simuladas: {ajuste['rodadas_simuladas']}")
+    print("=" * 90 + "\n")
+
+
+if __name__ == "__main__":
+    import sys
+
+    from . import leitura as l
+
+    instancias = sys.argv[1:] or ["rede50.txt", "rede100.txt", "rede200.txt", "rede400.txt"]
+    print(f"{'Instância':<12} {'Grade':>7} {'Ajuste':>7} {'Economia':>9} {'Melhor (grade)':>15} {'Melhor (ajuste)':>16}")
+    for instancia in instancias:
+        verificacao = verificar_contra_grade(l.leitura(instancia))
+        print(f"{instancia:<12} {verificacao['rodadas_grade']:>7} {verificacao['rodadas_ajuste']:>7} "
+              f"{verificacao['economia']:>8.1%} {verificacao['duracao_grade']:>15} {verificacao['duracao_ajuste']:>16}"
+              f"{'' if verificacao['coincide'] else '  (diverge)'}")
@@ -1,7 +1,10 @@
+import heapq
+import math
+
 from .node import Node, Mote, dist, MAX_RAIO
 from .cluster import calcular_custo_com_rotacao, consumir_energia_com_rotacao
 
-def geraArestas(nodes: list[Node], beta=0.5, cluster_heads=None):
+def geraArestas(nodes: list[Node], beta=0.5, cluster_heads=None, ordenar=True):
     """
     Gera uma lista de arestas usando custo energético como peso.
     
@@ -10,6 +13,7 @@ def geraArestas(nodes: list[Node], beta=0.5, cluster_heads=None):
     :param list[Node] nodes: Lista de nós.
     :param beta: Peso para balancear distância e energia
     :param cluster_heads: Conjunto de IDs dos cluster heads (opcional)
+    :param ordenar: Se False, não ordena (para ordenar depois com ordenar_arestas)
     :returns arcs: Lista de arestas (u, v, custo)
     """
 
@@ -42,9 +46,174 @@ def geraArestas(nodes: list[Node], beta=0.5, cluster_heads=None):
                 arcs.append((u.id, v.id, custo))
 
     # Ordena por custo energético
+    if ordenar:
+        ordenar_arestas(arcs)
+    return arcs
+
+def ordenar_arestas(arcs: list[tuple]):
+    """
+    Ordena as arestas por custo energético (ordenação estável, no local).
+
+    :param arcs: Lista de arestas (u, v, custo)
+    """
     arcs.sort(key=lambda arc: arc[2])
+
+def _vizinhos_em_alcance(nodes: list[Node], raio=MAX_RAIO):
+    """
+    Gera, para cada nó vivo i, a lista de vizinhos vivos j dentro do raio.
+
+    Usa uma grade espacial com células do tamanho do raio, de modo que só as
+    9 células ao redor de cada nó são examinadas.
+
+    :param nodes: Lista de nós
+    :param raio: Raio máximo de comunicação
+    :returns: Gerador de (i, [(j, distancia), ...])
+    """
+    def vivo(nd):
+        return not (isinstance(nd, Mote) and nd.bateria <= 0)
+
+    grade = {}
+    for i, nd in enumerate(nodes):
+        if vivo(nd):
+            grade.setdefault((math.floor(nd.x / raio), math.floor(nd.y / raio)), []).append(i)
+
+    for i, u in enumerate(nodes):
+        if not vivo(u):
+            continue
+        cx = math.floor(u.x / raio)
+        cy = math.floor(u.y / raio)
+        vizinhos = []
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for j in grade.get((cx + dx, cy + dy), ()):
+                    if j != i:
+                        distancia = dist(u, nodes[j])
+                        if distancia <= raio:
+                            vizinhos.append((j, distancia))
+        yield i, vizinhos
+
+def geraArestas_knn(nodes: list[Node], k: int, beta=0.5, cluster_heads=None, ordenar=True):
+    """
+    Gera arestas candidatas mantendo apenas os k vizinhos de menor custo de cada nó.
+
+    Arestas da Station são sempre mantidas, e arestas descartadas são
+    reincluídas (em ordem de custo) quando necessárias para preservar os
+    componentes conexos do grafo completo. O custo de cada par é calculado
+    uma única vez e oferecido às duas pontas.
+
+    :param list[Node] nodes: Lista de nós.
+    :param k: Número de vizinhos de menor custo mantidos por nó (pelo menos 1)
+    :param beta: Peso para balancear distância e energia
+    :param cluster_heads: Conjunto de IDs dos cluster heads (opcional)
+    :param ordenar: Se False, não ordena (para ordenar depois com ordenar_arestas)
+    :returns arcs: Lista de arestas (u, v, custo), no mesmo formato de geraArestas
+    :raises ValueError: Se k for menor que 1
+    """
+    if k < 1:
+        raise ValueError(f"k deve ser pelo menos 1: {k}")
+    if cluster_heads is None:
+        cluster_heads = set()
+
+    # Cada nó guarda seus k melhores vizinhos em um heap de máximo: (-custo, -vizinho)
+    melhores = {}
+    custos = {}
+    mantidas = {}
+    for i, vizinhos in _vizinhos_em_alcance(nodes):
+        for j, _ in vizinhos:
+            if j < i:
+                continue
+            # Mesmo sentido de geraArestas: o nó de maior índice é o destino
+            w = calcular_custo_com_rotacao(nodes[i], nodes[j], cluster_heads, beta)
+            custos[(i, j)] = w
+            if i == 0:
+                mantidas[(0, j)] = w
+            for a, b in ((i, j), (j, i)):
+                heap = melhores.setdefault(a, [])
+                if len(heap) < k:
+                    heapq.heappush(heap, (-w, -b))
+                elif (-w, -b) > heap[0]:
+                    heapq.heapreplace(heap, (-w, -b))
+
+    for i, heap in melhores.items():
+        if i == 0:
+            continue
+        for w, j in heap:
+            j = -j
+            mantidas[(min(i, j), max(i, j))] = -w
+
+    # Preserva a conectividade: reinclui as arestas mais baratas entre componentes
+    n = len(nodes)
+    link, size = unionfind_init(n)
+    for u, v in mantidas:
+        union(link, size, u, v)
+
+    pontes = sorted((w, u, v) for (u, v), w in custos.items() if find(link, u) != find(link, v))
+    for w, u, v in pontes:
+        if union(link, size, u, v):
+            mantidas[(u, v)] = w
+
+    # Mesma ordem de desempate de geraArestas: pares (i, j) em ordem crescente
+    arcs = [(u, v, w) for (u, v), w in sorted(mantidas.items())]
+    if ordenar:
+        ordenar_arestas(arcs)
     return arcs
 
+def custo_arvore(n: int, arcs: list[tuple]):
+    """
+    Custo total da floresta geradora mínima, sem descarregar energia.
+
+    :param n: Número de nós
+    :param arcs: Lista de arestas (u, v, custo) ordenada por custo
+    :returns: Tupla (custo total, número de arestas)
+    """
+    link, size = unionfind_init(n)
+    total = 0.0
+    arestas = 0
+    for u, v, w in arcs:
+        if union(link, size, u, v):
+            total += w
+            arestas += 1
+    return total, arestas
+
+def relatorio_poda(nodes: list[Node], k: int, beta=0.5, cluster_heads=None):
+    """
+    Compara as arestas podadas por geraArestas_knn com o conjunto completo.
+
+    Diagnóstico para instâncias pequenas: monta e ordena a lista completa de
+    arestas em memória, justamente o que geraArestas_knn evita.
+
+    :param list[Node] nodes: Lista de nós.
+    :param k: Número de vizinhos mantidos por nó
+    :param beta: Peso para balancear distância e energia
+    :param cluster_heads: Conjunto de IDs dos cluster heads (opcional)
+    :returns: Dicionário com arestas totais, mantidas, podadas e custo das árvores exata e podada
+    """
+    if cluster_heads is None:
+        cluster_heads = set()
+
+    completas = []
+    for i, vizinhos in _vizinhos_em_alcance(nodes):
+        for j, _ in vizinhos:
+            if i < j:
+                completas.append((i, j, calcular_custo_com_rotacao(nodes[i], nodes[j], cluster_heads, beta)))
+    completas.sort()
+    ordenar_arestas(completas)
+    podadas = geraArestas_knn(nodes, k, beta, cluster_heads)
+
+    custo_exato, arestas_exato = custo_arvore(len(nodes), completas)
+    custo_podado, arestas_podado = custo_arvore(len(nodes), podadas)
+
+    return {
+        "arestas_total": len(completas),
+        "arestas_mantidas": len(podadas),
+        "arestas_podadas": len(completas) - len(podadas),
+        "custo_exato": custo_exato,
+        "custo_podado": custo_podado,
+        "arestas_arvore_exata": arestas_exato,
+        "arestas_arvore_podada": arestas_podado,
+        "custo_difere": custo_podado != custo_exato,
+    }
+
 def unionfind_init(n: int):
     link = [i for i in range(n)]
     size = [1 for _ in range(n)]
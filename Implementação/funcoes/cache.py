@@ -0,0 +1,303 @@
+"""
+Cache em disco, endereçado por conteúdo, dos dados estáticos de uma instância.
+A chave é o hash SHA-256 do arquivo da instância junto com o raio de comunicação;
+cada entrada guarda em formato binário compacto as listas de nós críticos, a
+adjacência e as distâncias dos pares dentro do raio. O tamanho total da pasta é
+limitado, removendo primeiro as entradas usadas há mais tempo (LRU).
+"""
+
+import hashlib
+import os
+import struct
+import tempfile
+from array import array
+
+from . import conectividade as c
+from . import leitura as l
+from . import motor
+from .node import MAX_RAIO
+
+DIR_CACHE = os.path.join(l.BASE_DIR, "../.cache")
+LIMITE_PADRAO = 64 * 1024 * 1024
+
+MAGICO = b"RSSFCACH"
+VERSAO = 2
+
+# Cabeçalho: mágico, versão, raio, número de nós, número de pares, críticos (simulação), críticos (DFS)
+FORMATO_CABECALHO = "<8sHdIQII"
+TAMANHO_CABECALHO = struct.calcsize(FORMATO_CABECALHO)
+
+EXTENSAO = ".bin"
+
+
+def chave_instancia(instancia, raio=MAX_RAIO):
+    """
+    Calcula a chave do cache a partir do conteúdo da instância e do raio.
+
+    :param instancia: Nome do arquivo de instância (pasta instancias)
+    :param raio: Raio máximo de comunicação
+    :return: Hash hexadecimal
+    """
+    h = hashlib.sha256()
+    with open(os.path.join(l.DATA_DIR, instancia), "rb") as arquivo:
+        for bloco in iter(lambda: arquivo.read(1 << 16), b""):
+            h.update(bloco)
+    h.update(struct.pack("<Hd", VERSAO, raio))
+    return h.hexdigest()
+
+
+def _remover(caminho):
+    """Remove um arquivo do cache; retorna False se outro processo já o removeu."""
+    try:
+        os.remove(caminho)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+class EntradaCache():
+    """Dados estáticos de uma instância: nós críticos, adjacência (CSR) e pares dentro do raio."""
+
+    def __init__(self, raio, xs, ys, pares_u, pares_v, distancias, inicio_adj, vizinhos,
+                 criticos_simulacao, criticos_dfs):
+        self.__raio = raio
+        self.__xs = xs
+        self.__ys = ys
+        self.__pares_u = pares_u
+        self.__pares_v = pares_v
+        self.__distancias = distancias
+        self.__inicio_adj = inicio_adj
+        self.__vizinhos = vizinhos
+        self.__criticos_simulacao = criticos_simulacao
+        self.__criticos_dfs = criticos_dfs
+
+    @property
+    def raio(self) -> float:
+        return self.__raio
+
+    @property
+    def n(self) -> int:
+        return len(self.__xs)
+
+    @property
+    def criticos_simulacao(self) -> list:
+        return list(self.__criticos_simulacao)
+
+    @property
+    def criticos_dfs(self) -> list:
+        return list(self.__criticos_dfs)
+
+    def adjacencia(self):
+        """Reconstrói a adjacência no formato de conectividade.construir_grafo_adj."""
+        inicio = self.__inicio_adj
+        vizinhos = self.__vizinhos
+        return {i: list(vizinhos[inicio[i]:inicio[i + 1]]) for i in range(self.n)}
+
+    def topologia(self):
+        """Retorna a topologia do motor vetorial sem recalcular os pares."""
+        return motor.Topologia(self.__xs, self.__ys, self.__pares_u, self.__pares_v, self.__distancias)
+
+    @classmethod
+    def calcular(cls, nodes, raio=MAX_RAIO):
+        """
+        Calcula todos os dados estáticos a partir dos nós (baterias cheias).
+
+        :param nodes: Lista de nós da instância
+        :param raio: Raio máximo de comunicação
+        :return: EntradaCache
+        """
+        topologia = motor.construir_topologia(nodes, raio)
+        n = topologia.n
+
+        # Adjacência em formato CSR; os pares já vêm em ordem (i, j) crescente
+        graus = [0] * n
+        for k in range(topologia.m):
+            graus[topologia.pares_u[k]] += 1
+            graus[topologia.pares_v[k]] += 1
+        inicio_adj = array("q", [0]) * (n + 1)
+        for i in range(n):
+            inicio_adj[i + 1] = inicio_adj[i] + graus[i]
+        vizinhos = array("q", [0]) * inicio_adj[n]
+        posicao = list(inicio_adj[:n])
+        for u, v in zip(topologia.pares_u, topologia.pares_v):
+            vizinhos[posicao[v]] = u
+            posicao[v] += 1
+        for u, v in zip(topologia.pares_u, topologia.pares_v):
+            vizinhos[posicao[u]] = v
+            posicao[u] += 1
+
+        # Nós críticos calculados sobre a adjacência deste raio (e não de MAX_RAIO)
+        adj = {i: list(vizinhos[inicio_adj[i]:inicio_adj[i + 1]]) for i in range(n)}
+        _, criticos_simulacao = c.pontos_articulacao_station(adj, [True] * n)
+        criticos_dfs = c.encontrar_nos_criticos_dfs(nodes, adj)
+
+        return cls(raio, topologia.xs, topologia.ys, topologia.pares_u, topologia.pares_v, topologia.distancias,
+                   inicio_adj, vizinhos, sorted(nodes[i].id for i in criticos_simulacao), criticos_dfs)
+
+    def salvar(self, caminho):
+        """
+        Grava a entrada de forma atômica (arquivo temporário + renomeação).
+
+        O temporário tem nome único, então processos que gravam a mesma chave
+        ao mesmo tempo não interferem entre si (o último os.replace prevalece).
+        """
+        cabecalho = struct.pack(FORMATO_CABECALHO, MAGICO, VERSAO, self.__raio, self.n, len(self.__distancias),
+                                len(self.__criticos_simulacao), len(self.__criticos_dfs))
+
+        descritor, temporario = tempfile.mkstemp(dir=os.path.dirname(caminho) or ".", suffix=".tmp")
+        try:
+            with os.fdopen(descritor, "wb") as arquivo:
+                arquivo.write(cabecalho)
+                array("i", self.__criticos_simulacao).tofile(arquivo)
+                array("i", self.__criticos_dfs).tofile(arquivo)
+                array("d", self.__xs).tofile(arquivo)
+                array("d", self.__ys).tofile(arquivo)
+                array("q", self.__pares_u).tofile(arquivo)
+                array("q", self.__pares_v).tofile(arquivo)
+                array("d", self.__distancias).tofile(arquivo)
+                array("q", self.__inicio_adj).tofile(arquivo)
+                array("q", self.__vizinhos).tofile(arquivo)
+            os.replace(temporario, caminho)
+        except BaseException:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            raise
+
+    @classmethod
+    def carregar(cls, caminho):
+        """
+        Lê uma entrada gravada com salvar.
+
+        :param caminho: Caminho do arquivo da entrada
+        :return: EntradaCache
+        """
+        with open(caminho, "rb") as arquivo:
+            dados = arquivo.read(TAMANHO_CABECALHO)
+            if len(dados) != TAMANHO_CABECALHO:
+                raise ValueError(f"Entrada de cache truncada: {caminho}")
+
+            magico, versao, raio, n, m, n_sim, n_dfs = struct.unpack(FORMATO_CABECALHO, dados)
+            if magico != MAGICO:
+                raise ValueError(f"Arquivo não é uma entrada de cache válida: {caminho}")
+            if versao != VERSAO:
+                raise ValueError(f"Versão de cache não suportada: {versao}")
+
+            def ler(tipo, quantidade):
+                vetor = array(tipo)
+                vetor.fromfile(arquivo, quantidade)
+                return vetor
+
+            try:
+                criticos_simulacao = list(ler("i", n_sim))
+                criticos_dfs = list(ler("i", n_dfs))
+                xs = ler("d", n)
+                ys = ler("d", n)
+                pares_u = ler("q", m)
+                pares_v = ler("q", m)
+                distancias = ler("d", m)
+                inicio_adj = ler("q", n + 1)
+                vizinhos = ler("q", 2 * m)
+            except EOFError:
+                raise ValueError(f"Entrada de cache truncada: {caminho}")
+
+        return cls(raio, xs, ys, pares_u, pares_v, distancias, inicio_adj, vizinhos, criticos_simulacao, criticos_dfs)
+
+
+class CacheInstancias():
+    """
+    Cache em disco das entradas por instância, com limite de tamanho e remoção LRU.
+
+    O horário de modificação de cada arquivo registra o último uso.
+    """
+
+    def __init__(self, diretorio=DIR_CACHE, limite_bytes=LIMITE_PADRAO):
+        os.makedirs(diretorio, exist_ok=True)
+        self.__diretorio = diretorio
+        self.__limite_bytes = limite_bytes
+        self.__acertos = 0
+        self.__faltas = 0
+
+    @property
+    def acertos(self) -> int:
+        return self.__acertos
+
+    @property
+    def faltas(self) -> int:
+        return self.__faltas
+
+    def caminho(self, chave):
+        return os.path.join(self.__diretorio, chave + EXTENSAO)
+
+    def obter(self, instancia, nodes=None, raio=MAX_RAIO):
+        """
+        Retorna a entrada da instância, calculando e gravando-a se não estiver no cache.
+
+        :param instancia: Nome do arquivo de instância (pasta instancias)
+        :param nodes: Nós já lidos da instância (opcional; evita reler o arquivo numa falta)
+        :param raio: Raio máximo de comunicação
+        :return: EntradaCache
+        """
+        caminho = self.caminho(chave_instancia(instancia, raio))
+
+        # Outro processo pode remover a entrada a qualquer momento: ausência é uma falta
+        entrada = None
+        try:
+            entrada = EntradaCache.carregar(caminho)
+        except FileNotFoundError:
+            pass
+        except (ValueError, OSError):
+            # Entrada corrompida: descarta e recalcula
+            _remover(caminho)
+
+        if entrada is not None:
+            try:
+                os.utime(caminho)
+            except FileNotFoundError:
+                pass
+            self.__acertos += 1
+            return entrada
+
+        self.__faltas += 1
+        if nodes is None:
+            nodes = l.leitura(instancia)
+        entrada = EntradaCache.calcular(nodes, raio)
+        entrada.salvar(caminho)
+        self.remover_excedente(manter=caminho)
+        return entrada
+
+    def remover_excedente(self, manter=None):
+        """
+        Remove as entradas usadas há mais tempo até o cache caber no limite.
+
+        :param manter: Caminho que nunca é removido (a entrada recém-gravada)
+        :return: Lista de arquivos removidos
+        """
+        arquivos = []
+        for nome in os.listdir(self.__diretorio):
+            if nome.endswith(EXTENSAO):
+                caminho = os.path.join(self.__diretorio, nome)
+                try:
+                    info = os.stat(caminho)
+                except FileNotFoundError:
+                    # Já removida por outro processo
+                    continue
+                arquivos.append((info.st_mtime, caminho, info.st_size))
+
+        total = sum(tamanho for _, _, tamanho in arquivos)
+        removidos = []
+        for _, caminho, tamanho in sorted(arquivos):
+            if total <= self.__limite_bytes:
+                break
+            if caminho == manter:
+                continue
+            if _remover(caminho):
+                removidos.append(caminho)
+            total -= tamanho
+
+        return removidos
+
+    def limpar(self):
+        """Remove todas as entradas do cache."""
+        for nome in os.listdir(self.__diretorio):
+            if nome.endswith(EXTENSAO):
+                _remover(os.path.join(self.__diretorio, nome))
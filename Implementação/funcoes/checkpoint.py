@@ -0,0 +1,132 @@
+"""
+Módulo de checkpoints para simulações de descarga longas.
+Salva o estado da simulação em formato binário compacto para permitir retomar a execução.
+"""
+
+import os
+import struct
+import tempfile
+from array import array
+
+from . import node
+
+# Identificação e versão do formato binário
+MAGICO = b"RSSFCKPT"
+VERSAO = 2
+
+# Cabeçalho: mágico, versão, algoritmo, usar_cluster_heads, rodada, rodadas, beta, porcentagem_ch, n,
+# k_vizinhos (0 = arestas exatas de geraArestas)
+FORMATO_CABECALHO = "<8sHBBIIddII"
+TAMANHO_CABECALHO = struct.calcsize(FORMATO_CABECALHO)
+
+# Versão 1 (sem k_vizinhos) continua legível: sempre usa as arestas exatas
+FORMATO_CABECALHO_V1 = "<8sHBBIIddI"
+TAMANHO_CABECALHO_V1 = struct.calcsize(FORMATO_CABECALHO_V1)
+
+ALGORITMOS = ("kruskal", "prim")
+
+
+def salvar_checkpoint(caminho, nodes, rodada, parametros):
+    """
+    Salva o estado da simulação de forma atômica.
+
+    O arquivo é escrito em um temporário de nome único na mesma pasta e
+    depois renomeado, de modo que uma interrupção durante a escrita nunca
+    corrompe o checkpoint anterior e gravações concorrentes não disputam o
+    mesmo temporário.
+
+    :param caminho: Caminho do arquivo de checkpoint
+    :param nodes: Lista de nós da rede (Station + Motes)
+    :param rodada: Última rodada concluída
+    :param parametros: Dicionário com algoritmo, rodadas, beta, porcentagem_ch, usar_cluster_heads
+                       e k_vizinhos (opcional; None usa as arestas exatas)
+    """
+    n = len(nodes)
+    cabecalho = struct.pack(
+        FORMATO_CABECALHO,
+        MAGICO,
+        VERSAO,
+        ALGORITMOS.index(parametros["algoritmo"]),
+        1 if parametros["usar_cluster_heads"] else 0,
+        rodada,
+        parametros["rodadas"],
+        parametros["beta"],
+        parametros["porcentagem_ch"],
+        n,
+        parametros.get("k_vizinhos") or 0,
+    )
+
+    xs = array("d", (nd.x for nd in nodes))
+    ys = array("d", (nd.y for nd in nodes))
+    baterias = array("d", (nd.bateria for nd in nodes))
+
+    pasta, nome = os.path.split(os.path.abspath(caminho))
+    with tempfile.NamedTemporaryFile(dir=pasta, prefix=nome + ".", suffix=".tmp", delete=False) as arquivo:
+        temporario = arquivo.name
+        try:
+            arquivo.write(cabecalho)
+            xs.tofile(arquivo)
+            ys.tofile(arquivo)
+            baterias.tofile(arquivo)
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        except BaseException:
+            arquivo.close()
+            os.remove(temporario)
+            raise
+
+    os.replace(temporario, caminho)
+
+
+def carregar_checkpoint(caminho):
+    """
+    Carrega um checkpoint e reconstrói os nós com as baterias salvas.
+
+    :param caminho: Caminho do arquivo de checkpoint
+    :return: Tupla (nodes, rodada, parametros)
+    """
+    with open(caminho, "rb") as arquivo:
+        dados = arquivo.read(TAMANHO_CABECALHO_V1)
+        if len(dados) != TAMANHO_CABECALHO_V1:
+            raise ValueError(f"Checkpoint truncado: {caminho}")
+
+        magico, versao = struct.unpack_from("<8sH", dados)
+        if magico != MAGICO:
+            raise ValueError(f"Arquivo não é um checkpoint válido: {caminho}")
+        if versao == 1:
+            k_vizinhos = 0
+        elif versao == VERSAO:
+            dados += arquivo.read(TAMANHO_CABECALHO - TAMANHO_CABECALHO_V1)
+            if len(dados) != TAMANHO_CABECALHO:
+                raise ValueError(f"Checkpoint truncado: {caminho}")
+            k_vizinhos = struct.unpack(FORMATO_CABECALHO, dados)[-1]
+        else:
+            raise ValueError(f"Versão de checkpoint não suportada: {versao}")
+
+        _, _, algoritmo, usar_ch, rodada, rodadas, beta, porcentagem_ch, n = struct.unpack_from(FORMATO_CABECALHO_V1, dados)
+
+        xs = array("d")
+        ys = array("d")
+        baterias = array("d")
+        try:
+            xs.fromfile(arquivo, n)
+            ys.fromfile(arquivo, n)
+            baterias.fromfile(arquivo, n)
+        except EOFError:
+            raise ValueError(f"Checkpoint truncado: {caminho}")
+
+    # ERB é sempre id = 0, motes de 1 até n - 1
+    nodes = [node.Station(0, xs[0], ys[0])]
+    for i in range(1, n):
+        nodes.append(node.Mote(i, xs[i], ys[i], baterias[i]))
+
+    parametros = {
+        "algoritmo": ALGORITMOS[algoritmo],
+        "rodadas": rodadas,
+        "beta": beta,
+        "porcentagem_ch": porcentagem_ch,
+        "usar_cluster_heads": bool(usar_ch),
+        "k_vizinhos": k_vizinhos or None,
+    }
+
+    return nodes, rodada, parametros
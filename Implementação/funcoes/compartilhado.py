@@ -0,0 +1,149 @@
+"""
+Execução de cenários em paralelo com geometria em memória compartilhada.
+As coordenadas e os pares dentro do raio ficam em multiprocessing.shared_memory;
+os processos anexam a eles sem cópia e alocam apenas o próprio vetor de baterias.
+"""
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from . import motor
+from .node import MAX_BATERIA
+
+# Tipos dos blocos compartilhados (código de memoryview.cast, tamanho em bytes)
+_BLOCOS = (
+    ("xs", "d", 8),
+    ("ys", "d", 8),
+    ("pares_u", "q", 8),
+    ("pares_v", "q", 8),
+    ("distancias", "d", 8),
+)
+
+# Topologia anexada por cada processo de trabalho (preenchida no inicializador)
+_topologia_processo = None
+_memorias_processo = []
+
+
+class GeometriaCompartilhada():
+    """
+    Publica a topologia imutável da rede em blocos de memória compartilhada.
+
+    Deve ser usada como context manager (ou chamar fechar()) para liberar os blocos.
+    """
+
+    def __init__(self, topologia):
+        self.__memorias = []
+        self.__descritor = {"n": topologia.n, "m": topologia.m, "blocos": {}}
+
+        for nome, codigo, tamanho in _BLOCOS:
+            dados = getattr(topologia, nome)
+            # SharedMemory não aceita tamanho zero
+            memoria = shared_memory.SharedMemory(create=True, size=max(1, len(dados) * tamanho))
+            memoria.buf[:len(dados) * tamanho] = array(codigo, dados).tobytes()
+            self.__memorias.append(memoria)
+            self.__descritor["blocos"][nome] = memoria.name
+
+    @property
+    def descritor(self) -> dict:
+        """Dados leves (nomes dos blocos e tamanhos) enviados aos processos."""
+        return self.__descritor
+
+    def fechar(self):
+        for memoria in self.__memorias:
+            memoria.close()
+            memoria.unlink()
+        self.__memorias = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
+        return False
+
+
+def anexar_topologia(descritor):
+    """
+    Anexa os blocos compartilhados e monta uma Topologia sobre eles, sem cópia.
+
+    :param descritor: Descritor de GeometriaCompartilhada
+    :return: Tupla (topologia, memórias) — as memórias devem ser mantidas vivas
+    """
+    tamanhos = {"xs": descritor["n"], "ys": descritor["n"], "pares_u": descritor["m"],
+                "pares_v": descritor["m"], "distancias": descritor["m"]}
+    memorias = []
+    visoes = {}
+    for nome, codigo, tamanho in _BLOCOS:
+        memoria = shared_memory.SharedMemory(name=descritor["blocos"][nome])
+        memorias.append(memoria)
+        visoes[nome] = memoria.buf[:tamanhos[nome] * tamanho].cast(codigo)
+
+    topologia = motor.Topologia(visoes["xs"], visoes["ys"], visoes["pares_u"], visoes["pares_v"], visoes["distancias"])
+    return topologia, memorias
+
+
+def inicializar_processo(descritor):
+    """
+    Inicializador de processos de trabalho: anexa a geometria uma única vez.
+
+    Usado como initializer de ProcessPoolExecutor, com initargs=(descritor,).
+
+    :param descritor: Descritor de GeometriaCompartilhada
+    """
+    global _topologia_processo, _memorias_processo
+    _topologia_processo, _memorias_processo = anexar_topologia(descritor)
+
+
+def topologia_processo():
+    """
+    Topologia anexada por inicializar_processo no processo atual.
+
+    :return: Topologia sobre a memória compartilhada
+    """
+    if _topologia_processo is None:
+        raise RuntimeError("Processo sem geometria anexada: use inicializar_processo como initializer")
+    return _topologia_processo
+
+
+def _executar_cenario(cenario):
+    """Executa um cenário com vetor de baterias privado e retorna o resumo."""
+    topologia = topologia_processo()
+    baterias = array("d", [MAX_BATERIA]) * topologia.n
+
+    rodadas = motor.simular_descarga(
+        topologia, baterias,
+        cenario.get("algoritmo", "kruskal"),
+        cenario.get("rodadas", 2000),
+        cenario.get("beta", 0.5),
+        cenario.get("porcentagem_ch", 0.1),
+        cenario.get("usar_cluster_heads", True),
+    )
+
+    return {
+        "rodadas": rodadas,
+        "motes_ativos": sum(1 for i in range(1, topologia.n) if baterias[i] > 0),
+        "bateria_final": sum(baterias[i] for i in range(1, topologia.n)),
+    }
+
+
+def executar_cenarios_paralelos(nodes, cenarios, processos=2, topologia=None):
+    """
+    Executa vários cenários de simulação em paralelo sobre a mesma instância.
+
+    Cada cenário é um dicionário com algoritmo, rodadas, beta, porcentagem_ch e
+    usar_cluster_heads. Todos partem das baterias cheias.
+
+    :param nodes: Lista de nós da rede
+    :param cenarios: Lista de dicionários de cenário
+    :param processos: Número de processos de trabalho
+    :param topologia: Topologia pré-calculada (opcional)
+    :return: Lista de resultados na mesma ordem dos cenários
+    """
+    if topologia is None:
+        topologia = motor.construir_topologia(nodes)
+
+    with GeometriaCompartilhada(topologia) as geometria:
+        with ProcessPoolExecutor(max_workers=processos, initializer=inicializar_processo,
+                                 initargs=(geometria.descritor,)) as executor:
+            return list(executor.map(_executar_cenario, cenarios))
@@ -1,4 +1,5 @@
 import sys
+from bisect import bisect_right
 from .arvoregeradora import geraArestas, unionfind_init, union, find
 from .node import Mote, dist, MAX_RAIO
 
@@ -74,11 +75,15 @@ def construir_grafo_adj(nodes):
                 adj[j].append(i)
     return adj
 
-def encontrar_nos_criticos_dfs(nodes):
+def encontrar_nos_criticos_dfs(nodes, adj=None):
     """
     Identifica pontos de articulação usando DFS (Algoritmo de Tarjan).
+
+    :param nodes: Lista de nós da rede
+    :param adj: Lista de adjacência já calculada (opcional; padrão: construir_grafo_adj com MAX_RAIO)
     """
-    adj = construir_grafo_adj(nodes)
+    if adj is None:
+        adj = construir_grafo_adj(nodes)
     n = len(nodes)
     
     visited = [False] * n
@@ -134,11 +139,158 @@ def encontrar_nos_criticos_dfs(nodes):
     return sorted(lista_criticos)
 
 
+# =============================================================================
+# MÉTODO 3: RASTREAMENTO DURANTE A SIMULAÇÃO (RECÁLCULO POR MORTE DE MOTES)
+# =============================================================================
+
+def pontos_articulacao_station(adj, vivos):
+    """
+    Executa Tarjan iterativo a partir da Station considerando apenas nós vivos.
+
+    :param adj: Lista de adjacência baseada na distância
+    :param vivos: Lista booleana indicando quais nós ainda estão ativos
+    :return: Tupla (alcançáveis, pontos de articulação) — alcançáveis é a lista
+             de índices conectados à Station (sem incluí-la) e os pontos de
+             articulação são os motes cuja falha desconecta outros da Station
+    """
+    n = len(vivos)
+    discovery = [-1] * n
+    low = [0] * n
+    ap = [False] * n
+
+    discovery[0] = 0
+    time = 1
+    pilha = [(0, -1, iter(adj[0]))]
+
+    while pilha:
+        u, pai, vizinhos = pilha[-1]
+        avancou = False
+        for v in vizinhos:
+            if not vivos[v] or v == pai:
+                continue
+            if discovery[v] == -1:
+                discovery[v] = time
+                low[v] = time
+                time += 1
+                pilha.append((v, u, iter(adj[v])))
+                avancou = True
+                break
+            # Aresta de retorno (Back-edge)
+            low[u] = min(low[u], discovery[v])
+
+        if not avancou:
+            pilha.pop()
+            if pilha:
+                p = pilha[-1][0]
+                low[p] = min(low[p], low[u])
+                # A Station (raiz) nunca é reportada como ponto de articulação
+                if p != 0 and low[u] >= discovery[p]:
+                    ap[p] = True
+
+    alcancaveis = [i for i in range(1, n) if discovery[i] != -1]
+    pontos = [i for i in range(n) if ap[i]]
+    return alcancaveis, pontos
+
+
+class RastreadorConectividade():
+    """
+    Acompanha a conectividade com a Station ao longo de uma simulação.
+
+    O grafo de alcance é estático; a cada rodada só há recálculo quando
+    algum mote morre, de modo que o custo é proporcional ao número de
+    mortes e não ao número de rodadas.
+    """
+
+    def __init__(self, nodes, adj=None):
+        self.__adj = adj if adj is not None else construir_grafo_adj(nodes)
+        self.__vivos = [not isinstance(n, Mote) or n.bateria > 0 for n in nodes]
+        self.__motes_ativos = sum(1 for n in nodes if isinstance(n, Mote) and n.bateria > 0)
+        self.__historico = []
+        self.__rodada_particao = None
+
+        # Motes que já estão fora de alcance no início não contam como partição
+        alcancaveis, pontos = pontos_articulacao_station(self.__adj, self.__vivos)
+        self.__alcancaveis_iniciais = alcancaveis
+        self.__historico.append((0, len(alcancaveis), pontos))
+
+    def __recalcular(self, rodada):
+        alcancaveis, pontos = pontos_articulacao_station(self.__adj, self.__vivos)
+        self.__historico.append((rodada, len(alcancaveis), pontos))
+
+        # Partição: algum mote vivo que alcançava a Station perdeu a rota
+        if self.__rodada_particao is None:
+            conjunto = set(alcancaveis)
+            for i in self.__alcancaveis_iniciais:
+                if self.__vivos[i] and i not in conjunto:
+                    self.__rodada_particao = rodada
+                    break
+
+    def atualizar(self, rodada, nodes, motes_ativos=None):
+        """
+        Registra o estado da rede após a rodada, recalculando apenas se houve mortes.
+
+        :param rodada: Rodada recém concluída
+        :param nodes: Lista de nós da rede
+        :param motes_ativos: Número de motes com bateria (evita recontagem se informado)
+        :return: True se houve recálculo
+        """
+        if motes_ativos is None:
+            motes_ativos = sum(1 for n in nodes if isinstance(n, Mote) and n.bateria > 0)
+
+        # Baterias só diminuem: mesma contagem significa que ninguém morreu
+        if motes_ativos == self.__motes_ativos:
+            return False
+
+        for i, n in enumerate(nodes):
+            if self.__vivos[i] and isinstance(n, Mote) and n.bateria <= 0:
+                self.__vivos[i] = False
+        self.__motes_ativos = motes_ativos
+
+        self.__recalcular(rodada)
+        return True
+
+    def estado(self, rodada):
+        """
+        Retorna o estado de conectividade vigente ao final da rodada informada.
+
+        :param rodada: Número da rodada
+        :return: Tupla (motes alcançáveis, pontos de articulação)
+        """
+        i = bisect_right(self.__historico, rodada, key=lambda registro: registro[0]) - 1
+        _, alcancaveis, pontos = self.__historico[max(i, 0)]
+        return alcancaveis, pontos
+
+    @property
+    def historico(self) -> list:
+        """Lista de (rodada, motes alcançáveis, pontos de articulação) a cada mudança."""
+        return self.__historico
+
+    @property
+    def rodada_particao(self):
+        """Primeira rodada em que um mote ativo, antes conectado, perdeu a rota até a Station (None se nunca)."""
+        return self.__rodada_particao
+
+    @property
+    def pontos_articulacao(self) -> list:
+        return self.__historico[-1][2]
+
+    @property
+    def alcancaveis(self) -> int:
+        return self.__historico[-1][1]
+
+
 # =============================================================================
 # INTERFACE / RELATÓRIO
 # =============================================================================
 
-def exibir_relatorio_robustez(nodes):
+def exibir_relatorio_robustez(nodes, criticos_sim=None, criticos_dfs=None):
+    """
+    Exibe o comparativo entre os dois métodos de detecção de nós críticos.
+
+    :param nodes: Lista de nós da rede
+    :param criticos_sim: Resultado já calculado de encontrar_nos_criticos_simulacao (opcional, ex.: do cache)
+    :param criticos_dfs: Resultado já calculado de encontrar_nos_criticos_dfs (opcional, ex.: do cache)
+    """
     print("\n" + "=" * 80)
     print("ANÁLISE DE FRAGILIDADE DA REDE (COMPARATIVO)")
     print("=" * 80)
@@ -146,12 +298,14 @@ def exibir_relatorio_robustez(nodes):
 
     # --- Executa Método 1 (Simulação) ---
     print("\n[1] Método Simulação de Falha (Union-Find)...")
-    criticos_sim = encontrar_nos_criticos_simulacao(nodes)
+    if criticos_sim is None:
+        criticos_sim = encontrar_nos_criticos_simulacao(nodes)
     print(f"    -> Encontrou {len(criticos_sim)} nós críticos: {criticos_sim}")
 
     # --- Executa Método 2 (DFS / Tarjan) ---
     print("\n[2] Método Teoria dos Grafos (DFS / Tarjan)...")
-    criticos_dfs = encontrar_nos_criticos_dfs(nodes)
+    if criticos_dfs is None:
+        criticos_dfs = encontrar_nos_criticos_dfs(nodes)
     print(f"    -> Encontrou {len(criticos_dfs)} nós críticos: {criticos_dfs}")
 
     # --- Comparação ---
@@ -0,0 +1,247 @@
+"""
+Harness de equivalência entre motores de simulação.
+Os rastros "golden" por rodada vêm da implementação original (simular_descarga_kruskal/prim
+de main.py) e ficam congelados na pasta golden; motores alternativos são comparados
+contra eles, apontando a primeira rodada e o primeiro nó divergentes.
+
+Execute com: python -m funcoes.equivalencia [--gravar] [pasta_golden]
+(--gravar regenera os rastros golden a partir da implementação original)
+"""
+
+import gzip
+import io
+import json
+import os
+import random
+import sys
+
+from . import leitura as l
+from . import main
+from . import motor
+from .node import Mote, Station, MAX_BATERIA
+
+# Rastros golden congelados das instâncias padrão
+DIR_GOLDEN = os.path.join(l.BASE_DIR, "../golden")
+
+# Instâncias usadas por padrão: pequenas o suficiente para rodar a cada alteração
+INSTANCIAS_PADRAO = ("rede50.txt", "rede100.txt")
+SINTETICAS_PADRAO = ((60, 1), (120, 2))
+
+CENARIOS = (
+    ("kruskal", True),
+    ("kruskal", False),
+    ("prim", True),
+    ("prim", False),
+)
+
+
+def gerar_instancia_sintetica(n_motes, semente=0, lado=1000.0):
+    """
+    Gera uma rede aleatória com a Station no centro do campo.
+
+    :param n_motes: Número de motes
+    :param semente: Semente do gerador
+    :param lado: Tamanho do lado do campo quadrado
+    :return: Lista de nós (Station + Motes)
+    """
+    rng = random.Random(semente)
+    nodes = [Station(0, lado / 2, lado / 2)]
+    for i in range(n_motes):
+        nodes.append(Mote(i + 1, rng.uniform(0, lado), rng.uniform(0, lado), MAX_BATERIA))
+    return nodes
+
+
+class _GravadorRastro():
+    """Exportador (interface de ExportadorArvores) que guarda o estado de cada rodada."""
+
+    def __init__(self):
+        self.__rastro = []
+
+    @property
+    def rastro(self) -> list:
+        return self.__rastro
+
+    def registrar(self, rodada, nodes, tree, cluster_heads):
+        baterias = [nd.bateria if isinstance(nd, Mote) else MAX_BATERIA for nd in nodes]
+        self.__rastro.append((rodada, sorted(cluster_heads), len(tree), baterias))
+
+
+def rastro_referencia(nodes, algoritmo="kruskal", rodadas=2000, beta=0.5, porcentagem_ch=0.1, usar_cluster_heads=True):
+    """
+    Grava o rastro por rodada executando a implementação original.
+
+    Chama main.simular_descarga_kruskal/prim sobre uma cópia dos nós e registra
+    cada rodada pelo gancho de exportação, logo após a construção da árvore.
+
+    :param nodes: Lista de nós (não é alterada; a simulação roda sobre uma cópia)
+    :return: Lista de (rodada, cluster_heads ordenados, arestas na MST, baterias)
+    """
+    nodes = main.clonar_nodes(nodes)
+    simular = main.simular_descarga_kruskal if algoritmo == "kruskal" else main.simular_descarga_prim
+
+    gravador = _GravadorRastro()
+    simular(nodes, rodadas, beta, porcentagem_ch, verbose=False, usar_cluster_heads=usar_cluster_heads,
+            exportador=gravador)
+    return gravador.rastro
+
+
+def rastro_motor(nodes, algoritmo="kruskal", rodadas=2000, beta=0.5, porcentagem_ch=0.1, usar_cluster_heads=True):
+    """Grava o rastro por rodada usando o motor vetorial (motor.iterar_rodadas)."""
+    topologia = motor.construir_topologia(nodes)
+    baterias = motor.baterias_de_nodes(nodes)
+
+    rastro = []
+    for rodada, cluster_heads, tree, _ in motor.iterar_rodadas(topologia, baterias, algoritmo, rodadas, beta,
+                                                             porcentagem_ch, usar_cluster_heads):
+        rastro.append((rodada, sorted(cluster_heads), len(tree), list(baterias)))
+
+    return rastro
+
+
+# Motores alternativos verificados por padrão: nome -> função com a assinatura de rastro_referencia
+MOTORES = {
+    "motor": rastro_motor,
+}
+
+
+def comparar_rastros(esperado, obtido, tolerancia=1e-9):
+    """
+    Compara dois rastros rodada a rodada.
+
+    :param esperado: Rastro golden
+    :param obtido: Rastro do motor avaliado
+    :param tolerancia: Diferença absoluta máxima aceita nas baterias
+    :return: None se equivalentes; senão dicionário com rodada, campo, nó, esperado e obtido
+    """
+    for (rodada, ch_esp, arestas_esp, bat_esp), (_, ch_obt, arestas_obt, bat_obt) in zip(esperado, obtido):
+        if ch_esp != ch_obt:
+            no = next((i for i in sorted(set(ch_esp) ^ set(ch_obt))), None)
+            return {"rodada": rodada, "campo": "cluster_heads", "no": no, "esperado": ch_esp, "obtido": ch_obt}
+
+        if arestas_esp != arestas_obt:
+            return {"rodada": rodada, "campo": "arestas", "no": None, "esperado": arestas_esp, "obtido": arestas_obt}
+
+        if len(bat_esp) != len(bat_obt):
+            return {"rodada": rodada, "campo": "nos", "no": None, "esperado": len(bat_esp), "obtido": len(bat_obt)}
+
+        for i, (a, b) in enumerate(zip(bat_esp, bat_obt)):
+            if abs(a - b) > tolerancia:
+                return {"rodada": rodada, "campo": "bateria", "no": i, "esperado": a, "obtido": b}
+
+    if len(esperado) != len(obtido):
+        return {
+            "rodada": min(len(esperado), len(obtido)) + 1,
+            "campo": "rodadas",
+            "no": None,
+            "esperado": len(esperado),
+            "obtido": len(obtido),
+        }
+
+    return None
+
+
+def salvar_rastro(caminho, rastro):
+    """
+    Salva um rastro em JSON compactado (floats preservados exatamente).
+
+    O cabeçalho gzip não guarda horário nem nome, então o mesmo rastro gera
+    sempre o mesmo arquivo (os rastros golden não mudam ao serem regravados).
+    """
+    with open(caminho, "wb") as bruto:
+        with gzip.GzipFile(filename="", mode="wb", fileobj=bruto, mtime=0) as compactado:
+            with io.TextIOWrapper(compactado, encoding="utf-8") as arquivo:
+                json.dump(rastro, arquivo, separators=(",", ":"))
+
+
+def carregar_rastro(caminho):
+    """Carrega um rastro salvo com salvar_rastro."""
+    with gzip.open(caminho, "rt") as arquivo:
+        return [tuple(registro) for registro in json.load(arquivo)]
+
+
+def _casos(instancias, sinteticas):
+    for instancia in instancias:
+        yield instancia, l.leitura(instancia)
+    for n_motes, semente in sinteticas:
+        yield f"sintetica{n_motes}_s{semente}", gerar_instancia_sintetica(n_motes, semente)
+
+
+def caminho_golden(diretorio, nome_caso, algoritmo, usar_cluster_heads, rodadas, beta, porcentagem_ch):
+    """Caminho do rastro golden de um caso e cenário."""
+    modo_ch = "com_ch" if usar_cluster_heads else "sem_ch"
+    return os.path.join(diretorio, f"{nome_caso}_{algoritmo}_{modo_ch}_{rodadas}_{beta}_{porcentagem_ch}.json.gz")
+
+
+def verificar_equivalencia(motores=None, instancias=INSTANCIAS_PADRAO, sinteticas=SINTETICAS_PADRAO,
+                           rodadas=2000, beta=0.5, porcentagem_ch=0.1, tolerancia=1e-9, diretorio_golden=DIR_GOLDEN,
+                           gravar_golden=False):
+    """
+    Compara cada motor contra os rastros golden em todas as instâncias e cenários.
+
+    Os rastros são lidos de diretorio_golden (por padrão, os congelados no
+    repositório). Casos sem rastro salvo são calculados com a implementação
+    original e só são gravados se gravar_golden for True, que também regrava
+    os existentes.
+
+    :param motores: Dicionário nome -> função de rastro (padrão: MOTORES)
+    :param instancias: Arquivos de instância da pasta instancias
+    :param sinteticas: Pares (número de motes, semente) de instâncias sintéticas
+    :param rodadas: Número máximo de rodadas
+    :param beta: Peso para balancear distância e energia
+    :param porcentagem_ch: Porcentagem de nós que serão cluster heads
+    :param tolerancia: Diferença absoluta máxima aceita nas baterias
+    :param diretorio_golden: Pasta dos rastros golden (None calcula tudo na hora)
+    :param gravar_golden: Se True, regrava os rastros golden a partir da implementação original
+    :return: Lista de divergências (vazia se tudo for equivalente)
+    """
+    if motores is None:
+        motores = MOTORES
+    if diretorio_golden is not None and gravar_golden:
+        os.makedirs(diretorio_golden, exist_ok=True)
+
+    divergencias = []
+    for nome_caso, nodes in _casos(instancias, sinteticas):
+        for algoritmo, usar_cluster_heads in CENARIOS:
+            modo_ch = "com_ch" if usar_cluster_heads else "sem_ch"
+            parametros = (algoritmo, rodadas, beta, porcentagem_ch, usar_cluster_heads)
+
+            esperado = None
+            origem = "calculado"
+            if diretorio_golden is not None:
+                caminho = caminho_golden(diretorio_golden, nome_caso, algoritmo, usar_cluster_heads, rodadas, beta,
+                                         porcentagem_ch)
+                if not gravar_golden and os.path.exists(caminho):
+                    esperado = carregar_rastro(caminho)
+                    origem = "golden"
+            if esperado is None:
+                esperado = rastro_referencia(nodes, *parametros)
+                if diretorio_golden is not None and gravar_golden:
+                    salvar_rastro(caminho, esperado)
+                    origem = "gravado"
+
+            for nome_motor, rastrear in motores.items():
+                diferenca = comparar_rastros(esperado, rastrear(nodes, *parametros), tolerancia)
+                status = "OK" if diferenca is None else "DIVERGENTE"
+                print(f"  {nome_motor:<12} {nome_caso:<20} {algoritmo:<8} {modo_ch:<7} {len(esperado):>5} rodadas  "
+                      f"{origem:<9} {status}")
+                if diferenca is not None:
+                    diferenca.update({"motor": nome_motor, "caso": nome_caso, "algoritmo": algoritmo, "modo_ch": modo_ch})
+                    print(f"      -> rodada {diferenca['rodada']}, campo {diferenca['campo']}, nó {diferenca['no']}: "
+                          f"esperado {diferenca['esperado']}, obtido {diferenca['obtido']}")
+                    divergencias.append(diferenca)
+
+    return divergencias
+
+
+if __name__ == "__main__":
+    argumentos = sys.argv[1:]
+    gravar = "--gravar" in argumentos
+    pastas = [a for a in argumentos if a != "--gravar"]
+
+    print("=" * 80)
+    print("VERIFICAÇÃO DE EQUIVALÊNCIA DOS MOTORES")
+    print("=" * 80)
+    resultado = verificar_equivalencia(diretorio_golden=pastas[0] if pastas else DIR_GOLDEN, gravar_golden=gravar)
+    print("=" * 80)
+    print("✅ Todos os motores são equivalentes." if not resultado else f"⚠️  {len(resultado)} divergência(s).")
+    sys.exit(1 if resultado else 0)
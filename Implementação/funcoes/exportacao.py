@@ -0,0 +1,267 @@
+"""
+Exportação compacta das árvores de cada rodada.
+Cada árvore é gravada como vetor de pais enraizado na Station (componentes
+desligados da Station são enraizados no seu nó de menor id); as rodadas entre
+quadros-chave guardam apenas as diferenças em relação à rodada anterior. Os
+registros são compactados com zlib e um índice no final do arquivo permite
+ler qualquer rodada sem decodificar o arquivo inteiro.
+"""
+
+import struct
+import zlib
+from array import array
+from bisect import bisect_right
+
+MAGICO = b"RSSFARVR"
+VERSAO = 1
+
+# Cabeçalho: mágico, versão, número de nós, intervalo entre quadros-chave
+FORMATO_CABECALHO = "<8sHII"
+# Entrada do índice: rodada, deslocamento no arquivo, tamanho, tipo (0 = completo, 1 = delta)
+FORMATO_INDICE = "<IQIB"
+# Rodapé: deslocamento do índice e número de entradas
+FORMATO_RODAPE = "<QI"
+
+COMPLETO = 0
+DELTA = 1
+
+SEM_PAI = -1
+
+
+def arvore_para_pais(n, tree):
+    """
+    Converte as arestas de uma árvore em vetor de pais enraizado na Station (nó 0).
+
+    Quando a árvore é uma floresta, cada componente sem caminho até a Station é
+    enraizado no seu nó de menor id, de modo que todas as arestas são
+    preservadas. Raízes e nós fora da árvore ficam com SEM_PAI.
+
+    :param n: Número de nós
+    :param tree: Lista de arestas (u, v, custo)
+    :return: array('i') com o pai de cada nó
+    """
+    adj = [[] for _ in range(n)]
+    for u, v, *_ in tree:
+        adj[u].append(v)
+        adj[v].append(u)
+
+    pais = array("i", [SEM_PAI]) * n
+    visitados = [False] * n
+    for raiz in range(n):
+        if visitados[raiz] or (raiz > 0 and not adj[raiz]):
+            continue
+        visitados[raiz] = True
+        fila = [raiz]
+        for u in fila:
+            for v in adj[u]:
+                if not visitados[v]:
+                    visitados[v] = True
+                    pais[v] = u
+                    fila.append(v)
+
+    return pais
+
+
+def mesma_arvore(arestas, tree):
+    """
+    Compara arestas lidas de uma exportação com a árvore registrada, sem considerar orientação nem ordem.
+
+    :param arestas: Lista de (filho, pai), como retornada por LeitorArvores.arestas
+    :param tree: Lista de arestas (u, v, custo) registrada
+    :return: True se as duas representam o mesmo conjunto de arestas
+    """
+    def normalizar(pares):
+        return sorted((min(u, v), max(u, v)) for u, v in pares)
+
+    return normalizar(arestas) == normalizar((u, v) for u, v, *_ in tree)
+
+
+def verificar_exportacao(caminho, arvores):
+    """
+    Confere, rodada a rodada, se a leitura de uma exportação reproduz as árvores registradas.
+
+    :param caminho: Arquivo gravado por ExportadorArvores
+    :param arvores: Dicionário rodada -> arestas (u, v, custo) registradas
+    :return: Lista das rodadas que divergem (vazia se a exportação é fiel)
+    """
+    with LeitorArvores(caminho) as leitor:
+        return [rodada for rodada, tree in sorted(arvores.items())
+                if not mesma_arvore(leitor.arestas(rodada), tree)]
+
+
+class ExportadorArvores():
+    """
+    Grava as árvores por rodada em um arquivo binário compactado.
+
+    Pode ser passado como exportador para simular_descarga_kruskal/prim.
+    """
+
+    def __init__(self, caminho, n, intervalo_chave=50, nivel=6):
+        self.__arquivo = open(caminho, "wb")
+        self.__n = n
+        self.__intervalo_chave = intervalo_chave
+        self.__nivel = nivel
+        self.__indice = []
+        self.__anterior = None
+        self.__arquivo.write(struct.pack(FORMATO_CABECALHO, MAGICO, VERSAO, n, intervalo_chave))
+
+    def registrar(self, rodada, nodes, tree, cluster_heads=None):
+        """
+        Grava a árvore da rodada.
+
+        :param rodada: Número da rodada
+        :param nodes: Lista de nós (não utilizada; mantém a interface dos exportadores)
+        :param tree: Arestas da árvore (u, v, custo)
+        :param cluster_heads: Cluster heads da rodada (não utilizado)
+        """
+        pais = arvore_para_pais(self.__n, tree)
+
+        if self.__anterior is None or len(self.__indice) % self.__intervalo_chave == 0:
+            tipo = COMPLETO
+            dados = pais.tobytes()
+        else:
+            tipo = DELTA
+            anterior = self.__anterior
+            mudancas = array("i")
+            for i in range(self.__n):
+                if pais[i] != anterior[i]:
+                    mudancas.append(i)
+                    mudancas.append(pais[i])
+            dados = mudancas.tobytes()
+
+        bloco = zlib.compress(dados, self.__nivel)
+        self.__indice.append((rodada, self.__arquivo.tell(), len(bloco), tipo))
+        self.__arquivo.write(bloco)
+        self.__anterior = pais
+
+    def fechar(self):
+        """Grava o índice e o rodapé e fecha o arquivo."""
+        if self.__arquivo.closed:
+            return
+        inicio_indice = self.__arquivo.tell()
+        for entrada in self.__indice:
+            self.__arquivo.write(struct.pack(FORMATO_INDICE, *entrada))
+        self.__arquivo.write(struct.pack(FORMATO_RODAPE, inicio_indice, len(self.__indice)))
+        self.__arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
+        return False
+
+
+class LeitorArvores():
+    """Lê árvores de qualquer rodada de um arquivo gravado por ExportadorArvores."""
+
+    def __init__(self, caminho):
+        self.__arquivo = open(caminho, "rb")
+
+        cabecalho = self.__arquivo.read(struct.calcsize(FORMATO_CABECALHO))
+        magico, versao, n, intervalo_chave = struct.unpack(FORMATO_CABECALHO, cabecalho)
+        if magico != MAGICO:
+            raise ValueError(f"Arquivo não é uma exportação de árvores válida: {caminho}")
+        if versao != VERSAO:
+            raise ValueError(f"Versão de exportação não suportada: {versao}")
+        self.__n = n
+
+        tamanho_rodape = struct.calcsize(FORMATO_RODAPE)
+        self.__arquivo.seek(-tamanho_rodape, 2)
+        inicio_indice, quantidade = struct.unpack(FORMATO_RODAPE, self.__arquivo.read(tamanho_rodape))
+
+        tamanho_entrada = struct.calcsize(FORMATO_INDICE)
+        self.__arquivo.seek(inicio_indice)
+        dados = self.__arquivo.read(tamanho_entrada * quantidade)
+        self.__indice = [struct.unpack_from(FORMATO_INDICE, dados, i * tamanho_entrada) for i in range(quantidade)]
+        self.__rodadas = [entrada[0] for entrada in self.__indice]
+
+    @property
+    def n(self) -> int:
+        return self.__n
+
+    @property
+    def rodadas(self) -> list:
+        return list(self.__rodadas)
+
+    def __ler_bloco(self, posicao):
+        _, deslocamento, tamanho, tipo = self.__indice[posicao]
+        self.__arquivo.seek(deslocamento)
+        dados = array("i")
+        dados.frombytes(zlib.decompress(self.__arquivo.read(tamanho)))
+        return tipo, dados
+
+    def pais(self, rodada):
+        """
+        Reconstrói o vetor de pais da rodada a partir do quadro-chave mais próximo.
+
+        :param rodada: Número da rodada
+        :return: array('i') com o pai de cada nó (SEM_PAI para as raízes e nós fora da árvore)
+        """
+        posicao = bisect_right(self.__rodadas, rodada) - 1
+        if posicao < 0 or self.__rodadas[posicao] != rodada:
+            raise KeyError(f"Rodada {rodada} não exportada")
+
+        inicio = posicao
+        while self.__indice[inicio][3] != COMPLETO:
+            inicio -= 1
+
+        _, pais = self.__ler_bloco(inicio)
+        for p in range(inicio + 1, posicao + 1):
+            _, mudancas = self.__ler_bloco(p)
+            for i in range(0, len(mudancas), 2):
+                pais[mudancas[i]] = mudancas[i + 1]
+
+        return pais
+
+    def arestas(self, rodada):
+        """Retorna as arestas (filho, pai) da árvore da rodada."""
+        pais = self.pais(rodada)
+        return [(i, pais[i]) for i in range(self.__n) if pais[i] != SEM_PAI]
+
+    def fechar(self):
+        self.__arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
+        return False
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+    import tempfile
+
+    from . import leitura as l
+    from . import main
+
+    class _ExportadorConferido(ExportadorArvores):
+        """Exporta e guarda uma cópia de cada árvore para a conferência."""
+
+        def __init__(self, caminho, n):
+            super().__init__(caminho, n)
+            self.arvores = {}
+
+        def registrar(self, rodada, nodes, tree, cluster_heads=None):
+            super().registrar(rodada, nodes, tree, cluster_heads)
+            self.arvores[rodada] = list(tree)
+
+    instancia = sys.argv[1] if len(sys.argv) > 1 else "rede200.txt"
+    divergencias = 0
+    for nome, simular in (("Kruskal", main.simular_descarga_kruskal), ("Prim", main.simular_descarga_prim)):
+        nodes = l.leitura(instancia)
+        descritor, caminho = tempfile.mkstemp(suffix=".arv")
+        os.close(descritor)
+        try:
+            with _ExportadorConferido(caminho, len(nodes)) as exportador:
+                simular(nodes, 2000, verbose=False, exportador=exportador)
+            divergentes = verificar_exportacao(caminho, exportador.arvores)
+        finally:
+            os.remove(caminho)
+        divergencias += len(divergentes)
+        print(f"{nome}: {len(exportador.arvores)} rodadas exportadas, {len(divergentes)} divergentes"
+              + (f" (primeira: {divergentes[0]})" if divergentes else ""))
+    sys.exit(1 if divergencias else 0)
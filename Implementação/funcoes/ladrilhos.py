@@ -0,0 +1,356 @@
+"""
+Processamento em ladrilhos (fora da memória) para campos muito grandes.
+A instância de texto é convertida, em streaming, para um arquivo binário ordenado
+por ladrilho espacial (lado >= MAX_RAIO) e lida com mmap. Cada ladrilho é
+processado junto com os ladrilhos vizinhos (halo): gera as arestas que tocam o
+ladrilho, calcula a floresta geradora mínima local e só as arestas dessa floresta
+seguem para a fusão global. As candidatas ficam em vetores compactos de tamanho
+fixo; quando o limite é atingido, são ordenadas e gravadas em um arquivo
+temporário, e a fusão final é um Kruskal sobre a intercalação dessas sequências.
+"""
+
+import heapq
+import math
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+
+from .leitura import DATA_DIR
+from .node import MAX_BATERIA, MAX_RAIO
+
+MAGICO = b"RSSFLADR"
+VERSAO = 1
+
+# Cabeçalho: mágico, versão, número de nós, lado do ladrilho, número de ladrilhos
+FORMATO_CABECALHO = "<8sHQdQ"
+TAMANHO_CABECALHO = struct.calcsize(FORMATO_CABECALHO)
+# Entrada do índice: coluna, linha, primeiro registro, quantidade de registros
+FORMATO_INDICE = "<qqQQ"
+TAMANHO_INDICE = struct.calcsize(FORMATO_INDICE)
+# Registro de nó: id, x, y
+FORMATO_NO = "<qdd"
+TAMANHO_NO = struct.calcsize(FORMATO_NO)
+# Aresta candidata gravada em disco: custo, u, v
+FORMATO_CANDIDATA = "<dqq"
+TAMANHO_CANDIDATA = struct.calcsize(FORMATO_CANDIDATA)
+
+# Máximo de candidatas em memória (3 vetores de 8 bytes: 6 MiB), independente do número de nós
+LIMITE_CANDIDATAS = 1 << 18
+# Candidatas lidas de cada sequência em disco por vez durante a fusão
+BLOCO_LEITURA = 1 << 12
+
+VIZINHANCA = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+
+
+def _ler_coordenadas(caminho):
+    """Gera (id, x, y) lendo a instância de texto linha a linha (Station com id 0)."""
+    with open(caminho, "r") as arquivo:
+        n = int(arquivo.readline().strip())
+        for i in range(n + 1):
+            x, y = map(float, arquivo.readline().strip().replace(",", "").split())
+            yield i, x, y
+
+
+def converter_instancia(instancia, caminho_binario, lado=MAX_RAIO):
+    """
+    Converte uma instância de texto no formato binário ordenado por ladrilho.
+
+    Faz duas passagens de leitura (contagem e escrita), sem carregar os nós na
+    memória: cada registro é escrito direto na sua posição do arquivo mapeado.
+
+    :param instancia: Nome do arquivo de instância (pasta instancias) ou caminho
+    :param caminho_binario: Caminho do arquivo binário a gerar
+    :param lado: Lado do ladrilho (deve ser pelo menos MAX_RAIO)
+    :return: Número de ladrilhos não vazios
+    """
+    if lado < MAX_RAIO:
+        raise ValueError(f"O lado do ladrilho ({lado}) deve ser pelo menos MAX_RAIO ({MAX_RAIO})")
+    origem = os.path.join(DATA_DIR, instancia)
+
+    # 1ª passagem: quantos nós há em cada ladrilho
+    contagem = {}
+    n = 0
+    for _, x, y in _ler_coordenadas(origem):
+        chave = (math.floor(x / lado), math.floor(y / lado))
+        contagem[chave] = contagem.get(chave, 0) + 1
+        n += 1
+
+    chaves = sorted(contagem)
+    inicio = {}
+    posicao = 0
+    for chave in chaves:
+        inicio[chave] = posicao
+        posicao += contagem[chave]
+
+    inicio_registros = TAMANHO_CABECALHO + len(chaves) * TAMANHO_INDICE
+    tamanho = inicio_registros + n * TAMANHO_NO
+
+    temporario = caminho_binario + ".tmp"
+    with open(temporario, "w+b") as arquivo:
+        arquivo.truncate(tamanho)
+        with mmap.mmap(arquivo.fileno(), tamanho) as mapa:
+            struct.pack_into(FORMATO_CABECALHO, mapa, 0, MAGICO, VERSAO, n, lado, len(chaves))
+            for k, chave in enumerate(chaves):
+                struct.pack_into(FORMATO_INDICE, mapa, TAMANHO_CABECALHO + k * TAMANHO_INDICE,
+                                 chave[0], chave[1], inicio[chave], contagem[chave])
+
+            # 2ª passagem: cada nó vai para a próxima posição livre do seu ladrilho
+            proxima = dict(inicio)
+            for i, x, y in _ler_coordenadas(origem):
+                chave = (math.floor(x / lado), math.floor(y / lado))
+                struct.pack_into(FORMATO_NO, mapa, inicio_registros + proxima[chave] * TAMANHO_NO, i, x, y)
+                proxima[chave] += 1
+            mapa.flush()
+
+    os.replace(temporario, caminho_binario)
+    return len(chaves)
+
+
+class InstanciaLadrilhada():
+    """Acesso por ladrilho a um arquivo gerado por converter_instancia, via mmap."""
+
+    def __init__(self, caminho):
+        self.__arquivo = open(caminho, "rb")
+        self.__mapa = mmap.mmap(self.__arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magico, versao, n, lado, quantidade = struct.unpack_from(FORMATO_CABECALHO, self.__mapa, 0)
+        if magico != MAGICO:
+            raise ValueError(f"Arquivo não é uma instância ladrilhada válida: {caminho}")
+        if versao != VERSAO:
+            raise ValueError(f"Versão de instância ladrilhada não suportada: {versao}")
+        self.__n = n
+        self.__lado = lado
+
+        self.__indice = {}
+        for k in range(quantidade):
+            cx, cy, inicio, contagem = struct.unpack_from(FORMATO_INDICE, self.__mapa, TAMANHO_CABECALHO + k * TAMANHO_INDICE)
+            self.__indice[(cx, cy)] = (inicio, contagem)
+        self.__inicio_registros = TAMANHO_CABECALHO + quantidade * TAMANHO_INDICE
+
+    @property
+    def n(self) -> int:
+        return self.__n
+
+    @property
+    def lado(self) -> float:
+        return self.__lado
+
+    @property
+    def ladrilhos(self) -> list:
+        return sorted(self.__indice)
+
+    def contagem(self, chave):
+        return self.__indice.get(chave, (0, 0))[1]
+
+    def ladrilho(self, chave):
+        """
+        Lê os nós de um ladrilho.
+
+        :param chave: Tupla (coluna, linha) do ladrilho
+        :return: Lista de (id, x, y); vazia se o ladrilho não existir
+        """
+        if chave not in self.__indice:
+            return []
+        inicio, contagem = self.__indice[chave]
+        deslocamento = self.__inicio_registros + inicio * TAMANHO_NO
+        return list(struct.iter_unpack(FORMATO_NO, self.__mapa[deslocamento:deslocamento + contagem * TAMANHO_NO]))
+
+    def fechar(self):
+        self.__mapa.close()
+        self.__arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
+        return False
+
+
+def _floresta_minima(arestas, encontrar):
+    """
+    Kruskal sobre uma lista de arestas (custo, u, v) já ordenada.
+
+    :param arestas: Arestas ordenadas por (custo, u, v)
+    :param encontrar: Dicionário/vetor de representantes (alterado no local)
+    :return: Arestas escolhidas, na ordem
+    """
+    def raiz(x):
+        while encontrar[x] != x:
+            encontrar[x] = encontrar[encontrar[x]]
+            x = encontrar[x]
+        return x
+
+    escolhidas = []
+    for aresta in arestas:
+        a = raiz(aresta[1])
+        b = raiz(aresta[2])
+        if a != b:
+            encontrar[b] = a
+            escolhidas.append(aresta)
+    return escolhidas
+
+
+def _arestas_do_ladrilho(proprios, halo, beta, raio):
+    """
+    Arestas dentro do raio com pelo menos uma ponta no ladrilho.
+
+    Usa o custo de geraArestas com baterias cheias e sem cluster heads
+    (o nó de maior id é o destino, sempre um Mote).
+
+    :return: Lista de (custo, u, v) com u < v
+    """
+    termo_energia = (1.0 - beta) * (1.0 / (MAX_BATERIA + 0.0001))
+
+    grade = {}
+    for no in halo:
+        grade.setdefault((math.floor(no[1] / raio), math.floor(no[2] / raio)), []).append(no)
+    ids_proprios = {no[0] for no in proprios}
+
+    arestas = []
+    for i, xi, yi in proprios:
+        cx = math.floor(xi / raio)
+        cy = math.floor(yi / raio)
+        for dx, dy in VIZINHANCA:
+            for j, xj, yj in grade.get((cx + dx, cy + dy), ()):
+                # Pares internos ao ladrilho são gerados uma única vez
+                if j == i or (j < i and j in ids_proprios):
+                    continue
+                distancia = math.hypot(xi - xj, yi - yj)
+                if distancia <= raio:
+                    u, v = (i, j) if i < j else (j, i)
+                    arestas.append((beta * distancia + termo_energia, u, v))
+    return arestas
+
+
+def _gravar_sequencia(arquivo, custos, us, vs):
+    """
+    Ordena as candidatas por (custo, u, v) e acrescenta-as ao fim do arquivo temporário.
+
+    :return: Tupla (primeiro registro, quantidade) da sequência gravada
+    """
+    ordem = sorted(range(len(custos)), key=lambda i: (custos[i], us[i], vs[i]))
+    inicio = arquivo.tell() // TAMANHO_CANDIDATA
+    registro = struct.Struct(FORMATO_CANDIDATA)
+    buffer = bytearray(min(len(ordem), BLOCO_LEITURA) * TAMANHO_CANDIDATA)
+    for posicao_bloco in range(0, len(ordem), BLOCO_LEITURA):
+        bloco = ordem[posicao_bloco:posicao_bloco + BLOCO_LEITURA]
+        for posicao, i in enumerate(bloco):
+            registro.pack_into(buffer, posicao * TAMANHO_CANDIDATA, custos[i], us[i], vs[i])
+        arquivo.write(memoryview(buffer)[:len(bloco) * TAMANHO_CANDIDATA])
+    return inicio, len(ordem)
+
+
+def _ler_sequencia(mapa, inicio, quantidade, bloco):
+    """Gera (custo, u, v) de uma sequência gravada por _gravar_sequencia, bloco registros por vez."""
+    fim = inicio + quantidade
+    while inicio < fim:
+        proximo = min(inicio + bloco, fim)
+        yield from struct.iter_unpack(FORMATO_CANDIDATA, mapa[inicio * TAMANHO_CANDIDATA:proximo * TAMANHO_CANDIDATA])
+        inicio = proximo
+
+
+def arvore_ladrilhada(caminho_binario, beta=0.5, raio=MAX_RAIO, limite_candidatas=LIMITE_CANDIDATAS):
+    """
+    Calcula a floresta geradora mínima global processando um ladrilho por vez.
+
+    Para cada ladrilho, as arestas que o tocam (incluindo as que vão para o halo)
+    formam um subgrafo cuja floresta mínima contém todas as arestas da MST global
+    presentes nele. Cada aresta dessa floresta é mantida só pelo ladrilho do seu
+    nó de menor id e entra no conjunto de candidatas, guardado em três vetores
+    (custo, u, v). Quando os vetores chegam a limite_candidatas, são ordenados e
+    gravados em disco como uma sequência; no fim, as sequências são intercaladas
+    em ordem de (custo, u, v) e percorridas uma única vez pelo Kruskal. Além da
+    saída, a memória usada é o limite de candidatas mais o vetor de representantes.
+    A árvore resultante é igual à de kruskal(nodes, geraArestas(nodes, beta)) com
+    baterias cheias e sem cluster heads.
+
+    :param caminho_binario: Arquivo gerado por converter_instancia
+    :param beta: Peso para balancear distância e energia
+    :param raio: Raio máximo de comunicação (não pode exceder o lado do ladrilho)
+    :param limite_candidatas: Máximo de candidatas em memória antes de gravar uma sequência em disco
+    :return: Tupla de arrays (u, v, custo) das arestas da floresta, em ordem de custo
+    """
+    if limite_candidatas < 1:
+        raise ValueError(f"limite_candidatas deve ser positivo: {limite_candidatas}")
+
+    custos = array("d")
+    us = array("q")
+    vs = array("q")
+    sequencias = []
+
+    # Todas as sequências vão para um único arquivo temporário (apagado ao ser fechado)
+    with tempfile.TemporaryFile() as temporario:
+        with InstanciaLadrilhada(caminho_binario) as instancia:
+            if raio > instancia.lado:
+                raise ValueError(f"O raio ({raio}) não pode exceder o lado do ladrilho ({instancia.lado})")
+            n = instancia.n
+
+            for cx, cy in instancia.ladrilhos:
+                proprios = instancia.ladrilho((cx, cy))
+                halo = []
+                for dx, dy in VIZINHANCA:
+                    halo.extend(proprios if (dx, dy) == (0, 0) else instancia.ladrilho((cx + dx, cy + dy)))
+
+                arestas = _arestas_do_ladrilho(proprios, halo, beta, raio)
+                arestas.sort()
+                floresta = _floresta_minima(arestas, {no[0]: no[0] for no in halo})
+
+                # Cada aresta pertence ao ladrilho do seu nó de menor id
+                ids_proprios = {no[0] for no in proprios}
+                for custo, u, v in floresta:
+                    if u in ids_proprios:
+                        custos.append(custo)
+                        us.append(u)
+                        vs.append(v)
+                        if len(custos) >= limite_candidatas:
+                            sequencias.append(_gravar_sequencia(temporario, custos, us, vs))
+                            custos = array("d")
+                            us = array("q")
+                            vs = array("q")
+
+        mapa = None
+        if sequencias:
+            if custos:
+                sequencias.append(_gravar_sequencia(temporario, custos, us, vs))
+            custos = us = vs = None
+            temporario.flush()
+            mapa = mmap.mmap(temporario.fileno(), 0, access=mmap.ACCESS_READ)
+            # A leitura antecipada de todas as sequências somada também respeita o limite
+            bloco = max(1, min(BLOCO_LEITURA, limite_candidatas // len(sequencias)))
+            candidatas = heapq.merge(*(_ler_sequencia(mapa, inicio, quantidade, bloco)
+                                       for inicio, quantidade in sequencias))
+        else:
+            candidatas = sorted(zip(custos, us, vs))
+            custos = us = vs = None
+
+        # Fusão global: Kruskal sobre as candidatas em ordem de (custo, u, v)
+        encontrar = array("q", range(n))
+
+        def raiz(x):
+            while encontrar[x] != x:
+                encontrar[x] = encontrar[encontrar[x]]
+                x = encontrar[x]
+            return x
+
+        arvore_u = array("q")
+        arvore_v = array("q")
+        arvore_custo = array("d")
+        for custo, u, v in candidatas:
+            a = raiz(u)
+            b = raiz(v)
+            if a != b:
+                encontrar[b] = a
+                arvore_u.append(u)
+                arvore_v.append(v)
+                arvore_custo.append(custo)
+                if len(arvore_u) == n - 1:
+                    break
+
+        candidatas = None
+        if mapa is not None:
+            mapa.close()
+
+    return arvore_u, arvore_v, arvore_custo
@@ -1,8 +1,12 @@
 from . import leitura as l
 from . import arvoregeradora as mst
 from . import conectividade as c
+from . import checkpoint as ckpt
 from .node import Mote, MAX_BATERIA
 from .cluster import selecionar_cluster_heads
+from .perfil import Perfilador, PERFILADOR_NULO
+from . import memoria as mem
+from .cache import CacheInstancias
 import copy
 import os
 
@@ -60,7 +64,22 @@ def selecionar_arquivo_rede():
             return arquivos[0]
 
 
-def simular_descarga_kruskal(nodes, rodadas=5, beta=0.5, porcentagem_ch=0.1, verbose=True, usar_cluster_heads=True):
+def _validar_parametros(k_vizinhos, caminho_checkpoint=None, intervalo_checkpoint=100):
+    """
+    Valida o modo de arestas (None = exato) e o intervalo de checkpoints das simulações.
+
+    :raises ValueError: Se k_vizinhos for informado e menor que 1, ou se houver
+                        caminho_checkpoint e intervalo_checkpoint for menor que 1
+    """
+    if k_vizinhos is not None and k_vizinhos < 1:
+        raise ValueError(f"k_vizinhos deve ser pelo menos 1 (ou None para arestas exatas): {k_vizinhos}")
+    if caminho_checkpoint is not None and intervalo_checkpoint < 1:
+        raise ValueError(f"intervalo_checkpoint deve ser pelo menos 1: {intervalo_checkpoint}")
+
+
+def simular_descarga_kruskal(nodes, rodadas=5, beta=0.5, porcentagem_ch=0.1, verbose=True, usar_cluster_heads=True,
+                             caminho_checkpoint=None, intervalo_checkpoint=100, rodada_inicial=1, rastreador=None,
+                             perfil=None, exportador=None, k_vizinhos=None):
     """
     Simula a descarga de bateria dos nós ao longo de várias rodadas usando Kruskal.
     
@@ -72,22 +91,37 @@ def simular_descarga_kruskal(nodes, rodadas=5, beta=0.5, porcentagem_ch=0.1, ver
     :param porcentagem_ch: Porcentagem de nós que serão cluster heads por rodada
     :param verbose: Se True, imprime detalhes da simulação
     :param usar_cluster_heads: Se True, usa rotação de cluster heads; se False, não usa
+    :param caminho_checkpoint: Arquivo onde salvar checkpoints periódicos (opcional)
+    :param intervalo_checkpoint: Número de rodadas entre checkpoints
+    :param rodada_inicial: Rodada em que a simulação começa (usado ao retomar um checkpoint)
+    :param rastreador: RastreadorConectividade atualizado a cada rodada (opcional)
+    :param perfil: Perfilador que mede o tempo de cada fase da rodada (opcional)
+    :param exportador: Objeto com registrar(rodada, nodes, tree, cluster_heads), ex.: ExportadorArvores (opcional)
+    :param k_vizinhos: Se informado, mantém só os k vizinhos de menor custo de cada nó (geraArestas_knn)
     :return: Número de rodadas executadas
+    :raises ValueError: Se k_vizinhos for menor que 1, ou se houver checkpoint com intervalo menor que 1
     """
+    _validar_parametros(k_vizinhos, caminho_checkpoint, intervalo_checkpoint)
+    if perfil is None:
+        perfil = PERFILADOR_NULO
+    
     modo_ch = "COM" if usar_cluster_heads else "SEM"
     if verbose:
         print("=" * 60)
         print(f"SIMULAÇÃO KRUSKAL {modo_ch} CLUSTER HEADS")
         print("=" * 60)
     
-    rodadas_executadas = 0
+    rodadas_executadas = rodada_inicial - 1
     
-    for rodada in range(1, rodadas + 1):
+    for rodada in range(rodada_inicial, rodadas + 1):
+        perfil.nova_rodada(rodada)
+        
         # Seleciona cluster heads para esta rodada com rotação (ou conjunto vazio se não usar)
-        if usar_cluster_heads:
-            cluster_heads = selecionar_cluster_heads(nodes, porcentagem_ch, rodada)
-        else:
-            cluster_heads = set()
+        with perfil.fase("cluster_heads"):
+            if usar_cluster_heads:
+                cluster_heads = selecionar_cluster_heads(nodes, porcentagem_ch, rodada)
+            else:
+                cluster_heads = set()
         
         if verbose and (rodada <= 5 or rodada % 100 == 0):
             print(f"\n--- RODADA {rodada} ---")
@@ -95,31 +129,57 @@ def simular_descarga_kruskal(nodes, rodadas=5, beta=0.5, porcentagem_ch=0.1, ver
                 print(f"Cluster Heads selecionados: {sorted(cluster_heads)}")
         
         # Gera arestas e constrói MST considerando cluster heads
-        arcs = mst.geraArestas(nodes, beta, cluster_heads)
-        tree = mst.kruskal(nodes, arcs, beta, cluster_heads)
+        with perfil.fase("geraArestas"):
+            if k_vizinhos is None:
+                arcs = mst.geraArestas(nodes, beta, cluster_heads, ordenar=False)
+            else:
+                arcs = mst.geraArestas_knn(nodes, k_vizinhos, beta, cluster_heads, ordenar=False)
+        perfil.contar("geraArestas", len(arcs))
         
-        # Conta motes ativos
-        motes_ativos = 0
-        total_bateria = 0
-        for node in nodes:
-            if isinstance(node, Mote):
-                if node.bateria > 0:
-                    motes_ativos += 1
-                    total_bateria += node.bateria
+        with perfil.fase("ordenacao"):
+            mst.ordenar_arestas(arcs)
         
-        total_motes = len([n for n in nodes if isinstance(n, Mote)])
+        with perfil.fase("kruskal"):
+            tree = mst.kruskal(nodes, arcs, beta, cluster_heads)
+        perfil.contar("kruskal", len(arcs))
         
-        if verbose and (rodada <= 5 or rodada % 100 == 0):
-            print(f"\nEstado das baterias após rodada {rodada}:")
+        # Conta motes ativos
+        with perfil.fase("estatisticas"):
+            motes_ativos = 0
+            total_bateria = 0
             for node in nodes:
                 if isinstance(node, Mote):
-                    status = "ATIVO" if node.bateria > 0 else "SEM BATERIA"
-                    ch_marker = " [CH]" if node.id in cluster_heads else ""
-                    print(f"  Mote {node.id}: {node.bateriaPct:.2f}% ({node.bateria:.2f}) - {status}{ch_marker}")
+                    if node.bateria > 0:
+                        motes_ativos += 1
+                        total_bateria += node.bateria
             
-            print(f"\nMotes ativos: {motes_ativos}/{total_motes}")
-            print(f"Bateria total restante: {total_bateria:.2f}")
-            print(f"Arestas na MST: {len(tree)}")
+            total_motes = len([n for n in nodes if isinstance(n, Mote)])
+        
+        # Exporta a árvore da rodada
+        if exportador is not None:
+            with perfil.fase("exportacao"):
+                exportador.registrar(rodada, nodes, tree, cluster_heads)
+        
+        # Atualiza conectividade com a Station (só recalcula se algum mote morreu)
+        if rastreador is not None:
+            with perfil.fase("conectividade"):
+                rastreador.atualizar(rodada, nodes, motes_ativos)
+        
+        if verbose and (rodada <= 5 or rodada % 100 == 0):
+            with perfil.fase("saida"):
+                print(f"\nEstado das baterias após rodada {rodada}:")
+                for node in nodes:
+                    if isinstance(node, Mote):
+                        status = "ATIVO" if node.bateria > 0 else "SEM BATERIA"
+                        ch_marker = " [CH]" if node.id in cluster_heads else ""
+                        print(f"  Mote {node.id}: {node.bateriaPct:.2f}% ({node.bateria:.2f}) - {status}{ch_marker}")
+                
+                print(f"\nMotes ativos: {motes_ativos}/{total_motes}")
+                print(f"Bateria total restante: {total_bateria:.2f}")
+                print(f"Arestas na MST: {len(tree)}")
+                if rastreador is not None:
+                    print(f"Motes alcançáveis pela Station: {rastreador.alcancaveis}/{motes_ativos}")
+                    print(f"Pontos de articulação atuais: {rastreador.pontos_articulacao}")
         
         rodadas_executadas = rodada
         
@@ -133,6 +193,18 @@ def simular_descarga_kruskal(nodes, rodadas=5, beta=0.5, porcentagem_ch=0.1, ver
             if verbose:
                 print(f"\n*** SIMULAÇÃO ENCERRADA NA RODADA {rodada}: Não há mais arestas disponíveis na MST ***")
             break
+        
+        # Salva checkpoint periódico para permitir retomar a simulação
+        if caminho_checkpoint is not None and rodada % intervalo_checkpoint == 0:
+            with perfil.fase("checkpoint"):
+                ckpt.salvar_checkpoint(caminho_checkpoint, nodes, rodada, {
+                    "algoritmo": "kruskal",
+                    "rodadas": rodadas,
+                    "beta": beta,
+                    "porcentagem_ch": porcentagem_ch,
+                    "usar_cluster_heads": usar_cluster_heads,
+                    "k_vizinhos": k_vizinhos
+                })
     
     if verbose:
         print("\n" + "=" * 60)
@@ -155,7 +227,9 @@ def simular_descarga_kruskal(nodes, rodadas=5, beta=0.5, porcentagem_ch=0.1, ver
     return rodadas_executadas
 
 
-def simular_descarga_prim(nodes, rodadas=5, beta=0.5, porcentagem_ch=0.1, verbose=True, usar_cluster_heads=True):
+def simular_descarga_prim(nodes, rodadas=5, beta=0.5, porcentagem_ch=0.1, verbose=True, usar_cluster_heads=True,
+                          caminho_checkpoint=None, intervalo_checkpoint=100, rodada_inicial=1, rastreador=None,
+                          perfil=None, exportador=None, k_vizinhos=None):
     """
     Simula a descarga de bateria dos nós ao longo de várias rodadas usando Prim.
     
@@ -167,22 +241,37 @@ def simular_descarga_prim(nodes, rodadas=5, beta=0.5, porcentagem_ch=0.1, verbos
     :param porcentagem_ch: Porcentagem de nós que serão cluster heads por rodada
     :param verbose: Se True, imprime detalhes da simulação
     :param usar_cluster_heads: Se True, usa rotação de cluster heads; se False, não usa
+    :param caminho_checkpoint: Arquivo onde salvar checkpoints periódicos (opcional)
+    :param intervalo_checkpoint: Número de rodadas entre checkpoints
+    :param rodada_inicial: Rodada em que a simulação começa (usado ao retomar um checkpoint)
+    :param rastreador: RastreadorConectividade atualizado a cada rodada (opcional)
+    :param perfil: Perfilador que mede o tempo de cada fase da rodada (opcional)
+    :param exportador: Objeto com registrar(rodada, nodes, tree, cluster_heads), ex.: ExportadorArvores (opcional)
+    :param k_vizinhos: Se informado, mantém só os k vizinhos de menor custo de cada nó (geraArestas_knn)
     :return: Número de rodadas executadas
+    :raises ValueError: Se k_vizinhos for menor que 1, ou se houver checkpoint com intervalo menor que 1
     """
+    _validar_parametros(k_vizinhos, caminho_checkpoint, intervalo_checkpoint)
+    if perfil is None:
+        perfil = PERFILADOR_NULO
+    
     modo_ch = "COM" if usar_cluster_heads else "SEM"
     if verbose:
         print("=" * 60)
         print(f"SIMULAÇÃO PRIM {modo_ch} CLUSTER HEADS")
         print("=" * 60)
     
-    rodadas_executadas = 0
+    rodadas_executadas = rodada_inicial - 1
     
-    for rodada in range(1, rodadas + 1):
+    for rodada in range(rodada_inicial, rodadas + 1):
+        perfil.nova_rodada(rodada)
+        
         # Seleciona cluster heads para esta rodada com rotação (ou conjunto vazio se não usar)
-        if usar_cluster_heads:
-            cluster_heads = selecionar_cluster_heads(nodes, porcentagem_ch, rodada)
-        else:
-            cluster_heads = set()
+        with perfil.fase("cluster_heads"):
+            if usar_cluster_heads:
+                cluster_heads = selecionar_cluster_heads(nodes, porcentagem_ch, rodada)
+            else:
+                cluster_heads = set()
         
         if verbose and (rodada <= 5 or rodada % 100 == 0):
             print(f"\n--- RODADA {rodada} ---")
@@ -190,31 +279,57 @@ def simular_descarga_prim(nodes, rodadas=5, beta=0.5, porcentagem_ch=0.1, verbos
                 print(f"Cluster Heads selecionados: {sorted(cluster_heads)}")
         
         # Gera arestas e constrói MST usando Prim
-        arcs = mst.geraArestas(nodes, beta, cluster_heads)
-        tree = mst.prim(nodes, arcs, beta, cluster_heads)
+        with perfil.fase("geraArestas"):
+            if k_vizinhos is None:
+                arcs = mst.geraArestas(nodes, beta, cluster_heads, ordenar=False)
+            else:
+                arcs = mst.geraArestas_knn(nodes, k_vizinhos, beta, cluster_heads, ordenar=False)
+        perfil.contar("geraArestas", len(arcs))
         
-        # Conta motes ativos
-        motes_ativos = 0
-        total_bateria = 0
-        for node in nodes:
-            if isinstance(node, Mote):
-                if node.bateria > 0:
-                    motes_ativos += 1
-                    total_bateria += node.bateria
+        with perfil.fase("ordenacao"):
+            mst.ordenar_arestas(arcs)
         
-        total_motes = len([n for n in nodes if isinstance(n, Mote)])
+        with perfil.fase("prim"):
+            tree = mst.prim(nodes, arcs, beta, cluster_heads)
+        perfil.contar("prim", len(arcs))
         
-        if verbose and (rodada <= 5 or rodada % 100 == 0):
-            print(f"\nEstado das baterias após rodada {rodada}:")
+        # Conta motes ativos
+        with perfil.fase("estatisticas"):
+            motes_ativos = 0
+            total_bateria = 0
             for node in nodes:
                 if isinstance(node, Mote):
-                    status = "ATIVO" if node.bateria > 0 else "SEM BATERIA"
-                    ch_marker = " [CH]" if node.id in cluster_heads else ""
-                    print(f"  Mote {node.id}: {node.bateriaPct:.2f}% ({node.bateria:.2f}) - {status}{ch_marker}")
+                    if node.bateria > 0:
+                        motes_ativos += 1
+                        total_bateria += node.bateria
             
-            print(f"\nMotes ativos: {motes_ativos}/{total_motes}")
-            print(f"Bateria total restante: {total_bateria:.2f}")
-            print(f"Arestas na MST: {len(tree)}")
+            total_motes = len([n for n in nodes if isinstance(n, Mote)])
+        
+        # Exporta a árvore da rodada
+        if exportador is not None:
+            with perfil.fase("exportacao"):
+                exportador.registrar(rodada, nodes, tree, cluster_heads)
+        
+        # Atualiza conectividade com a Station (só recalcula se algum mote morreu)
+        if rastreador is not None:
+            with perfil.fase("conectividade"):
+                rastreador.atualizar(rodada, nodes, motes_ativos)
+        
+        if verbose and (rodada <= 5 or rodada % 100 == 0):
+            with perfil.fase("saida"):
+                print(f"\nEstado das baterias após rodada {rodada}:")
+                for node in nodes:
+                    if isinstance(node, Mote):
+                        status = "ATIVO" if node.bateria > 0 else "SEM BATERIA"
+                        ch_marker = " [CH]" if node.id in cluster_heads else ""
+                        print(f"  Mote {node.id}: {node.bateriaPct:.2f}% ({node.bateria:.2f}) - {status}{ch_marker}")
+                
+                print(f"\nMotes ativos: {motes_ativos}/{total_motes}")
+                print(f"Bateria total restante: {total_bateria:.2f}")
+                print(f"Arestas na MST: {len(tree)}")
+                if rastreador is not None:
+                    print(f"Motes alcançáveis pela Station: {rastreador.alcancaveis}/{motes_ativos}")
+                    print(f"Pontos de articulação atuais: {rastreador.pontos_articulacao}")
         
         rodadas_executadas = rodada
         
@@ -228,6 +343,18 @@ def simular_descarga_prim(nodes, rodadas=5, beta=0.5, porcentagem_ch=0.1, verbos
             if verbose:
                 print(f"\n*** SIMULAÇÃO ENCERRADA NA RODADA {rodada}: Não há mais arestas disponíveis na MST ***")
             break
+        
+        # Salva checkpoint periódico para permitir retomar a simulação
+        if caminho_checkpoint is not None and rodada % intervalo_checkpoint == 0:
+            with perfil.fase("checkpoint"):
+                ckpt.salvar_checkpoint(caminho_checkpoint, nodes, rodada, {
+                    "algoritmo": "prim",
+                    "rodadas": rodadas,
+                    "beta": beta,
+                    "porcentagem_ch": porcentagem_ch,
+                    "usar_cluster_heads": usar_cluster_heads,
+                    "k_vizinhos": k_vizinhos
+                })
     
     if verbose:
         print("\n" + "=" * 60)
@@ -250,6 +377,56 @@ def simular_descarga_prim(nodes, rodadas=5, beta=0.5, porcentagem_ch=0.1, verbos
     return rodadas_executadas
 
 
+# Valor padrão de retomar_simulacao: usa o modo de arestas gravado no checkpoint
+K_VIZINHOS_DO_CHECKPOINT = object()
+
+
+def retomar_simulacao(caminho_checkpoint, verbose=True, intervalo_checkpoint=100, k_vizinhos=K_VIZINHOS_DO_CHECKPOINT,
+                      rastreador=None, perfil=None, exportador=None):
+    """
+    Retoma uma simulação de descarga a partir de um checkpoint salvo.
+    
+    A execução continua na rodada seguinte à salva, com os mesmos parâmetros
+    (inclusive o modo de arestas: exato ou k vizinhos), produzindo o mesmo
+    resultado que a simulação original sem interrupção.
+    
+    :param caminho_checkpoint: Arquivo de checkpoint a ser retomado
+    :param verbose: Se True, imprime detalhes da simulação
+    :param intervalo_checkpoint: Número de rodadas entre novos checkpoints
+    :param k_vizinhos: Modo de arestas esperado (None = exato); por padrão usa o do checkpoint
+    :param rastreador: RastreadorConectividade atualizado a partir da rodada retomada (opcional)
+    :param perfil: Perfilador das rodadas retomadas (opcional)
+    :param exportador: Exportador das árvores das rodadas retomadas (opcional)
+    :return: Tupla (nodes, rodadas executadas)
+    :raises ValueError: Se k_vizinhos ou intervalo_checkpoint forem menores que 1, ou se k_vizinhos for informado
+                        e diferir do modo gravado no checkpoint
+    """
+    _validar_parametros(None if k_vizinhos is K_VIZINHOS_DO_CHECKPOINT else k_vizinhos,
+                        caminho_checkpoint, intervalo_checkpoint)
+    
+    nodes, rodada, parametros = ckpt.carregar_checkpoint(caminho_checkpoint)
+    
+    if k_vizinhos is not K_VIZINHOS_DO_CHECKPOINT and k_vizinhos != parametros["k_vizinhos"]:
+        raise ValueError(f"O checkpoint usa k_vizinhos={parametros['k_vizinhos']}, mas foi pedido k_vizinhos={k_vizinhos}")
+    
+    if parametros["algoritmo"] == "kruskal":
+        simular = simular_descarga_kruskal
+    else:
+        simular = simular_descarga_prim
+    
+    rodadas_executadas = simular(nodes, parametros["rodadas"], parametros["beta"], parametros["porcentagem_ch"], verbose,
+                                 usar_cluster_heads=parametros["usar_cluster_heads"],
+                                 caminho_checkpoint=caminho_checkpoint,
+                                 intervalo_checkpoint=intervalo_checkpoint,
+                                 rodada_inicial=rodada + 1,
+                                 rastreador=rastreador,
+                                 perfil=perfil,
+                                 exportador=exportador,
+                                 k_vizinhos=parametros["k_vizinhos"])
+    
+    return nodes, rodadas_executadas
+
+
 def clonar_nodes(nodes):
     """
     Cria uma cópia profunda dos nós para simulação independente.
@@ -260,7 +437,8 @@ def clonar_nodes(nodes):
     return copy.deepcopy(nodes)
 
 
-def comparar_algoritmos(instancia="rede50.txt", rodadas=2000, beta=0.5, porcentagem_ch=0.1, verbose=False):
+def comparar_algoritmos(instancia="rede50.txt", rodadas=2000, beta=0.5, porcentagem_ch=0.1, verbose=False,
+                        rastrear_conectividade=False, perfilar=False, contabilizar_memoria=False, usar_cache=False):
     """
     Compara o desempenho de Kruskal e Prim em termos de número de rodadas.
     
@@ -272,6 +450,10 @@ def comparar_algoritmos(instancia="rede50.txt", rodadas=2000, beta=0.5, porcenta
     :param beta: Peso para balancear distância e energia
     :param porcentagem_ch: Porcentagem de nós que serão cluster heads
     :param verbose: Se True, imprime detalhes das simulações
+    :param rastrear_conectividade: Se True, acompanha a conectividade com a Station durante as simulações
+    :param perfilar: Se True, mede o tempo de cada fase das simulações e exibe um resumo por cenário
+    :param contabilizar_memoria: Se True, registra memória por fase e por estrutura (tracemalloc)
+    :param usar_cache: Se True, lê nós críticos e adjacência do cache em disco (calculando-os só na primeira vez)
     :return: Dicionário com resultados da comparação
     """
     print("\n" + "=" * 90)
@@ -283,34 +465,69 @@ def comparar_algoritmos(instancia="rede50.txt", rodadas=2000, beta=0.5, porcenta
     print(f"Porcentagem de Cluster Heads: {porcentagem_ch * 100}%")
     print("=" * 90)
     
+    # Contabilidade de memória (a versão nula não mede nada)
+    memoria = mem.ContabilidadeMemoria() if contabilizar_memoria else mem.CONTABILIDADE_NULA
+    
     # Carrega nós para Kruskal COM cluster heads
-    nodes_kruskal_ch = l.leitura(instancia)
+    nodes_kruskal_ch = memoria.medir_estrutura(mem.NOS_LEITURA, l.leitura, instancia)
+    memoria.marcar_fase("Leitura da instância")
     total_motes = len([n for n in nodes_kruskal_ch if isinstance(n, Mote)])
-    c.exibir_relatorio_robustez(nodes_kruskal_ch)
+    
+    # Dados estáticos da instância (dependem só das coordenadas e do raio)
+    entrada_cache = CacheInstancias().obter(instancia, nodes_kruskal_ch) if usar_cache else None
+    if entrada_cache is not None:
+        c.exibir_relatorio_robustez(nodes_kruskal_ch, entrada_cache.criticos_simulacao, entrada_cache.criticos_dfs)
+    else:
+        c.exibir_relatorio_robustez(nodes_kruskal_ch)
+    memoria.marcar_fase("Relatório de robustez")
     
     # Clona nós para as outras simulações (simulações independentes)
-    nodes_kruskal_sem_ch = clonar_nodes(nodes_kruskal_ch)
-    nodes_prim_ch = clonar_nodes(nodes_kruskal_ch)
-    nodes_prim_sem_ch = clonar_nodes(nodes_kruskal_ch)
+    nodes_kruskal_sem_ch = memoria.medir_estrutura("Clone Kruskal SEM CH (por nó)", clonar_nodes, nodes_kruskal_ch)
+    nodes_prim_ch = memoria.medir_estrutura("Clone Prim COM CH (por nó)", clonar_nodes, nodes_kruskal_ch)
+    nodes_prim_sem_ch = memoria.medir_estrutura("Clone Prim SEM CH (por nó)", clonar_nodes, nodes_kruskal_ch)
+    memoria.marcar_fase("Clonagem dos cenários")
+    
+    # Mede arestas, adjacência e Union-Find com as baterias ainda cheias
+    if contabilizar_memoria:
+        mem.medir_estruturas(memoria, nodes_kruskal_ch, beta)
+        memoria.marcar_fase(mem.FASE_MEDICAO)
+    
+    # Rastreadores de conectividade compartilham o grafo de alcance estático
+    rastreadores = {"kruskal_com_ch": None, "kruskal_sem_ch": None, "prim_com_ch": None, "prim_sem_ch": None}
+    if rastrear_conectividade:
+        adj = entrada_cache.adjacencia() if entrada_cache is not None else c.construir_grafo_adj(nodes_kruskal_ch)
+        for chave in rastreadores:
+            rastreadores[chave] = c.RastreadorConectividade(nodes_kruskal_ch, adj)
+    
+    # Perfiladores por cenário (None mantém a instrumentação desligada)
+    perfis = {chave: Perfilador() if perfilar else None for chave in rastreadores}
     
     print(f"\nTotal de motes: {total_motes}")
     print("-" * 90)
     
     # Simulação com Kruskal COM cluster heads
     print("\n>>> Executando simulação com KRUSKAL COM Cluster Heads...")
-    rodadas_kruskal_ch = simular_descarga_kruskal(nodes_kruskal_ch, rodadas, beta, porcentagem_ch, verbose, usar_cluster_heads=True)
+    rodadas_kruskal_ch = simular_descarga_kruskal(nodes_kruskal_ch, rodadas, beta, porcentagem_ch, verbose, usar_cluster_heads=True,
+                                                  rastreador=rastreadores["kruskal_com_ch"], perfil=perfis["kruskal_com_ch"])
+    memoria.marcar_fase("Simulação Kruskal COM CH")
     
     # Simulação com Kruskal SEM cluster heads
     print("\n>>> Executando simulação com KRUSKAL SEM Cluster Heads...")
-    rodadas_kruskal_sem_ch = simular_descarga_kruskal(nodes_kruskal_sem_ch, rodadas, beta, porcentagem_ch, verbose, usar_cluster_heads=False)
+    rodadas_kruskal_sem_ch = simular_descarga_kruskal(nodes_kruskal_sem_ch, rodadas, beta, porcentagem_ch, verbose, usar_cluster_heads=False,
+                                                      rastreador=rastreadores["kruskal_sem_ch"], perfil=perfis["kruskal_sem_ch"])
+    memoria.marcar_fase("Simulação Kruskal SEM CH")
     
     # Simulação com Prim COM cluster heads
     print("\n>>> Executando simulação com PRIM COM Cluster Heads...")
-    rodadas_prim_ch = simular_descarga_prim(nodes_prim_ch, rodadas, beta, porcentagem_ch, verbose, usar_cluster_heads=True)
+    rodadas_prim_ch = simular_descarga_prim(nodes_prim_ch, rodadas, beta, porcentagem_ch, verbose, usar_cluster_heads=True,
+                                            rastreador=rastreadores["prim_com_ch"], perfil=perfis["prim_com_ch"])
+    memoria.marcar_fase("Simulação Prim COM CH")
     
     # Simulação com Prim SEM cluster heads
     print("\n>>> Executando simulação com PRIM SEM Cluster Heads...")
-    rodadas_prim_sem_ch = simular_descarga_prim(nodes_prim_sem_ch, rodadas, beta, porcentagem_ch, verbose, usar_cluster_heads=False)
+    rodadas_prim_sem_ch = simular_descarga_prim(nodes_prim_sem_ch, rodadas, beta, porcentagem_ch, verbose, usar_cluster_heads=False,
+                                                rastreador=rastreadores["prim_sem_ch"], perfil=perfis["prim_sem_ch"])
+    memoria.marcar_fase("Simulação Prim SEM CH")
     
     # Calcula bateria final restante e motes ativos para cada simulação
     bateria_final_kruskal_ch = sum(n.bateria for n in nodes_kruskal_ch if isinstance(n, Mote))
@@ -332,6 +549,10 @@ def comparar_algoritmos(instancia="rede50.txt", rodadas=2000, beta=0.5, porcenta
     print(f"{'Rodadas executadas':<35} {rodadas_kruskal_ch:>12} {rodadas_kruskal_sem_ch:>12} {rodadas_prim_ch:>12} {rodadas_prim_sem_ch:>12}")
     print(f"{'Motes ativos ao final':<35} {motes_ativos_kruskal_ch:>12} {motes_ativos_kruskal_sem_ch:>12} {motes_ativos_prim_ch:>12} {motes_ativos_prim_sem_ch:>12}")
     print(f"{'Bateria total restante':<35} {bateria_final_kruskal_ch:>12.2f} {bateria_final_kruskal_sem_ch:>12.2f} {bateria_final_prim_ch:>12.2f} {bateria_final_prim_sem_ch:>12.2f}")
+    if rastrear_conectividade:
+        particoes = [rastreadores[chave].rodada_particao for chave in rastreadores]
+        particoes = ["-" if p is None else p for p in particoes]
+        print(f"{'Rodada da primeira partição':<35} {particoes[0]:>12} {particoes[1]:>12} {particoes[2]:>12} {particoes[3]:>12}")
     print("-" * 90)
     
     # Comparações entre abordagens
@@ -388,7 +609,7 @@ def comparar_algoritmos(instancia="rede50.txt", rodadas=2000, beta=0.5, porcenta
     print(f">>> MELHOR DESEMPENHO: {vencedor} com {todas_rodadas[vencedor]} rodadas")
     print("=" * 90)
     
-    return {
+    resultados = {
         "kruskal_com_ch": {
             "rodadas": rodadas_kruskal_ch,
             "motes_ativos": motes_ativos_kruskal_ch,
@@ -411,6 +632,33 @@ def comparar_algoritmos(instancia="rede50.txt", rodadas=2000, beta=0.5, porcenta
         },
         "vencedor": vencedor
     }
+    
+    if contabilizar_memoria:
+        memoria.finalizar()
+        memoria.exibir_relatorio()
+        n_arestas = memoria.estruturas[mem.LISTA_ARESTAS][1]
+        soma = mem.soma_estruturas(memoria, len(nodes_kruskal_ch), n_arestas)
+        print(f"Estruturas listadas (limite inferior): {soma / 2**20:.3f} MB | "
+              f"fator de calibração pelo pico observado: {mem.fator_calibracao(memoria):.2f}")
+        resultados["memoria"] = {
+            "fases": memoria.fases,
+            "estruturas": memoria.estruturas,
+            "pico": memoria.pico,
+            "pico_execucao": memoria.pico_execucao,
+            "fator_calibracao": mem.fator_calibracao(memoria)
+        }
+    
+    if perfilar:
+        for chave, perfil in perfis.items():
+            perfil.exibir_resumo(f"PERFIL DA SIMULAÇÃO - {chave.upper()}")
+            resultados[chave]["perfil"] = perfil.totais
+    
+    if rastrear_conectividade:
+        for chave, rastreador in rastreadores.items():
+            resultados[chave]["rodada_particao"] = rastreador.rodada_particao
+            resultados[chave]["historico_conectividade"] = rastreador.historico
+    
+    return resultados
 
 
 def main():
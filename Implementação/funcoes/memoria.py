@@ -0,0 +1,223 @@
+"""
+Módulo de contabilidade de memória.
+Usa tracemalloc para medir o pico por fase e o tamanho das principais estruturas da simulação.
+"""
+
+import copy
+import tracemalloc
+
+from . import arvoregeradora as mst
+from .conectividade import construir_grafo_adj
+
+# Abaixo deste número de elementos, bytes/elemento não é confiável: objetos reaproveitados
+# das free lists do CPython (floats, tuplas, dicts) não passam pelo alocador e não aparecem
+# no tracemalloc (subestima), e alocações únicas, como o crescimento de caches internos,
+# caem na primeira medição (superestima); as duas pesam mais em amostras pequenas
+AMOSTRA_MINIMA = 10000
+
+# Entrada usada por estimar_memoria para o custo de cada cenário clonado
+CLONE_AMOSTRA = "Cenário clonado (amostra, por nó)"
+
+# Entradas de referência: nós lidos e arestas da instância medida
+NOS_LEITURA = "Nós (leitura, por nó)"
+LISTA_ARESTAS = "Lista de arestas (por aresta)"
+
+# Fase de medir_estruturas: seu pico vem das próprias amostras e não entra na calibração
+FASE_MEDICAO = "Medição das estruturas"
+
+
+class ContabilidadeMemoria():
+    """
+    Registra memória atual e pico de cada fase e o tamanho de estruturas individuais.
+
+    Liga o tracemalloc ao ser criada (se ainda não estiver ligado) e o desliga
+    em finalizar(), de modo que o custo só existe quando o modo está ativo.
+    """
+
+    def __init__(self):
+        self.__iniciou = not tracemalloc.is_tracing()
+        if self.__iniciou:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        self.__fases = []
+        self.__estruturas = {}
+
+    def marcar_fase(self, nome):
+        """
+        Registra a memória ao final de uma fase e reinicia a contagem de pico.
+
+        :param nome: Nome da fase
+        """
+        atual, pico = tracemalloc.get_traced_memory()
+        self.__fases.append((nome, atual, pico))
+        tracemalloc.reset_peak()
+
+    def medir_estrutura(self, nome, construtor, *args, quantidade=None, repeticoes=1, **kwargs):
+        """
+        Constrói uma estrutura e registra quantos bytes foram alocados para ela.
+
+        Com repeticoes > 1, constrói várias cópias mantendo todas vivas até o fim da
+        medição, para que a amostra tenha pelo menos AMOSTRA_MINIMA elementos.
+
+        :param nome: Nome da estrutura
+        :param construtor: Função que cria a estrutura
+        :param quantidade: Número de elementos (nós ou arestas) de uma cópia, para o cálculo por unidade
+        :param repeticoes: Número de cópias construídas
+        :return: A primeira estrutura criada
+        """
+        antes = tracemalloc.get_traced_memory()[0]
+        copias = [construtor(*args, **kwargs) for _ in range(repeticoes)]
+        depois = tracemalloc.get_traced_memory()[0]
+
+        estrutura = copias[0]
+        if quantidade is None:
+            quantidade = len(estrutura)
+        self.__estruturas[nome] = (depois - antes, quantidade * repeticoes)
+        return estrutura
+
+    def finalizar(self):
+        """Desliga o tracemalloc se foi ligado por esta instância."""
+        if self.__iniciou and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @property
+    def fases(self) -> list:
+        """Lista de (fase, bytes atuais, pico da fase)."""
+        return list(self.__fases)
+
+    @property
+    def estruturas(self) -> dict:
+        """Dicionário {estrutura: (bytes, quantidade de elementos)}."""
+        return dict(self.__estruturas)
+
+    @property
+    def pico(self) -> int:
+        return max((pico for _, _, pico in self.__fases), default=0)
+
+    @property
+    def pico_execucao(self) -> int:
+        """Maior pico entre as fases, sem a fase de medição (FASE_MEDICAO)."""
+        return max((pico for nome, _, pico in self.__fases if nome != FASE_MEDICAO), default=0)
+
+    def bytes_por_unidade(self, nome):
+        """Bytes por elemento da estrutura informada (0 se não medida)."""
+        tamanho, quantidade = self.__estruturas.get(nome, (0, 0))
+        return tamanho / quantidade if quantidade else 0.0
+
+    def exibir_relatorio(self):
+        print("\n" + "=" * 80)
+        print("CONTABILIDADE DE MEMÓRIA")
+        print("=" * 80)
+        print(f"{'Fase':<35} {'Atual (MB)':>14} {'Pico (MB)':>14}")
+        print("-" * 80)
+        for nome, atual, pico in self.__fases:
+            print(f"{nome:<35} {atual / 2**20:>14.3f} {pico / 2**20:>14.3f}")
+        print("-" * 80)
+        print(f"{'Estrutura':<35} {'Total (MB)':>14} {'Elementos':>12} {'Bytes/elem':>12}")
+        print("-" * 80)
+        pequenas = False
+        for nome, (tamanho, quantidade) in self.__estruturas.items():
+            por_unidade = tamanho / quantidade if quantidade else 0.0
+            marca = "*" if quantidade < AMOSTRA_MINIMA else " "
+            pequenas = pequenas or quantidade < AMOSTRA_MINIMA
+            print(f"{nome:<35} {tamanho / 2**20:>14.3f} {quantidade:>12} {por_unidade:>12.1f}{marca}")
+        print("-" * 80)
+        if pequenas:
+            print(f"* Amostra com menos de {AMOSTRA_MINIMA} elementos: bytes/elem é só indicativo. Objetos reaproveitados")
+            print("  das free lists do CPython não aparecem no tracemalloc e alocações únicas caem na primeira medição.")
+        print(f"Pico geral: {self.pico / 2**20:.3f} MB | sem a fase de medição: {self.pico_execucao / 2**20:.3f} MB")
+        print("=" * 80 + "\n")
+
+
+class ContabilidadeNula():
+    """Contabilidade desligada: constrói as estruturas sem medir nada."""
+
+    def marcar_fase(self, nome):
+        pass
+
+    def medir_estrutura(self, nome, construtor, *args, quantidade=None, repeticoes=1, **kwargs):
+        return construtor(*args, **kwargs)
+
+    def finalizar(self):
+        pass
+
+
+# Instância compartilhada usada quando a contabilidade não está ativa
+CONTABILIDADE_NULA = ContabilidadeNula()
+
+
+def medir_estruturas(contabilidade, nodes, beta=0.5):
+    """
+    Mede as estruturas principais de uma rede: arestas, adjacência e Union-Find,
+    além de uma amostra grande de cenários clonados (CLONE_AMOSTRA) para a estimativa.
+
+    As estruturas são construídas apenas para medição e descartadas em seguida.
+
+    :param contabilidade: ContabilidadeMemoria ativa
+    :param nodes: Lista de nós da rede
+    :param beta: Peso para balancear distância e energia
+    """
+    arcs = contabilidade.medir_estrutura(LISTA_ARESTAS, mst.geraArestas, nodes, beta)
+    contabilidade.medir_estrutura("Adjacência (por aresta)", construir_grafo_adj, nodes, quantidade=len(arcs))
+    contabilidade.medir_estrutura("Union-Find (por nó)", mst.unionfind_init, len(nodes), quantidade=len(nodes))
+
+    # Clones repetidos até AMOSTRA_MINIMA nós: em redes pequenas um único clone subestima o custo
+    repeticoes = max(1, -(-AMOSTRA_MINIMA // len(nodes)))
+    contabilidade.medir_estrutura(CLONE_AMOSTRA, copy.deepcopy, nodes, repeticoes=repeticoes)
+
+
+def soma_estruturas(contabilidade, n_nodes, n_arestas, cenarios=4):
+    """
+    Soma das estruturas listadas (nós, clones, arestas, adjacência e Union-Find)
+    para uma rede com n nós e m arestas, pelos bytes por elemento medidos.
+
+    É um limite inferior: listas temporárias de cada rodada, o interpretador e
+    objetos das free lists do CPython ficam de fora.
+
+    :param contabilidade: ContabilidadeMemoria com as estruturas medidas
+    :param n_nodes: Número de nós da rede
+    :param n_arestas: Número de arestas dentro do raio
+    :param cenarios: Número de cenários simulados (cópias dos nós)
+    :return: Bytes
+    """
+    por_no = contabilidade.bytes_por_unidade(NOS_LEITURA)
+    por_no_clone = contabilidade.bytes_por_unidade(CLONE_AMOSTRA)
+    por_aresta = (contabilidade.bytes_por_unidade(LISTA_ARESTAS)
+                  + contabilidade.bytes_por_unidade("Adjacência (por aresta)"))
+    por_no_uf = contabilidade.bytes_por_unidade("Union-Find (por nó)")
+    return int(n_nodes * (por_no + por_no_clone * (cenarios - 1) + por_no_uf) + por_aresta * n_arestas)
+
+
+def fator_calibracao(contabilidade, cenarios=4):
+    """
+    Razão entre o pico observado (sem a fase de medição) e a soma das estruturas
+    na instância medida.
+
+    :param contabilidade: ContabilidadeMemoria com fases e estruturas registradas
+    :param cenarios: Número de cenários simulados na instância medida
+    :return: Fator (1.0 se não houver medições suficientes)
+    """
+    estruturas = contabilidade.estruturas
+    if NOS_LEITURA not in estruturas or LISTA_ARESTAS not in estruturas:
+        return 1.0
+    soma = soma_estruturas(contabilidade, estruturas[NOS_LEITURA][1], estruturas[LISTA_ARESTAS][1], cenarios)
+    if soma <= 0 or contabilidade.pico_execucao <= 0:
+        return 1.0
+    return contabilidade.pico_execucao / soma
+
+
+def estimar_memoria(contabilidade, n_nodes, n_arestas, cenarios=4):
+    """
+    Estima o pico de memória de uma rede com n nós e m arestas.
+
+    A soma das estruturas (soma_estruturas) é multiplicada pelo fator de
+    calibração da instância medida, de modo que, nela, a estimativa coincide
+    com o pico observado, e em outras instâncias escala com n e m.
+
+    :param contabilidade: ContabilidadeMemoria com fases e estruturas registradas
+    :param n_nodes: Número de nós da rede
+    :param n_arestas: Número de arestas dentro do raio
+    :param cenarios: Número de cenários simulados (cópias dos nós)
+    :return: Estimativa em bytes
+    """
+    return int(soma_estruturas(contabilidade, n_nodes, n_arestas, cenarios) * fator_calibracao(contabilidade, cenarios))
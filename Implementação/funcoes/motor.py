@@ -0,0 +1,347 @@
+"""
+Motor de simulação baseado em vetores.
+Reproduz exatamente simular_descarga_kruskal/prim usando a geometria pré-calculada
+(coordenadas e pares dentro do raio) e um vetor de baterias, sem objetos Node/Mote.
+"""
+
+import heapq
+import math
+from array import array
+
+from .node import Mote, MAX_BATERIA, MAX_RAIO
+
+
+class Topologia():
+    """
+    Geometria imutável da rede: coordenadas e pares (i, j), i < j, dentro do raio.
+
+    Os pares seguem a mesma ordem em que geraArestas percorre os nós, e as
+    distâncias são calculadas com a mesma fórmula de dist(), de modo que o
+    motor reproduz bit a bit os custos da implementação original. Os campos
+    podem ser listas, arrays ou memoryviews (ex.: memória compartilhada).
+    """
+
+    def __init__(self, xs, ys, pares_u, pares_v, distancias):
+        self.__xs = xs
+        self.__ys = ys
+        self.__pares_u = pares_u
+        self.__pares_v = pares_v
+        self.__distancias = distancias
+
+    @property
+    def xs(self):
+        return self.__xs
+
+    @property
+    def ys(self):
+        return self.__ys
+
+    @property
+    def pares_u(self):
+        return self.__pares_u
+
+    @property
+    def pares_v(self):
+        return self.__pares_v
+
+    @property
+    def distancias(self):
+        return self.__distancias
+
+    @property
+    def n(self) -> int:
+        return len(self.__xs)
+
+    @property
+    def m(self) -> int:
+        return len(self.__distancias)
+
+
+def construir_topologia(nodes, raio=MAX_RAIO):
+    """
+    Calcula os pares de nós dentro do raio usando uma grade espacial.
+
+    :param nodes: Lista de nós (Station no índice 0)
+    :param raio: Raio máximo de comunicação
+    :return: Topologia da rede
+    """
+    n = len(nodes)
+    xs = array("d", (nd.x for nd in nodes))
+    ys = array("d", (nd.y for nd in nodes))
+
+    # Grade com células do tamanho do raio: vizinhos estão nas 9 células ao redor
+    grade = {}
+    for i in range(n):
+        chave = (math.floor(xs[i] / raio), math.floor(ys[i] / raio))
+        grade.setdefault(chave, []).append(i)
+
+    pares_u = array("q")
+    pares_v = array("q")
+    distancias = array("d")
+
+    for i in range(n):
+        cx = math.floor(xs[i] / raio)
+        cy = math.floor(ys[i] / raio)
+        vizinhos = []
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for j in grade.get((cx + dx, cy + dy), ()):
+                    if j > i:
+                        vizinhos.append(j)
+        vizinhos.sort()
+
+        for j in vizinhos:
+            # Mesma fórmula de node.dist(nodes[i], nodes[j])
+            distancia = math.hypot(xs[i] - xs[j], ys[i] - ys[j])
+            if distancia <= raio:
+                pares_u.append(i)
+                pares_v.append(j)
+                distancias.append(distancia)
+
+    return Topologia(xs, ys, pares_u, pares_v, distancias)
+
+
+def baterias_de_nodes(nodes):
+    """
+    Extrai o vetor de baterias (a Station fica com MAX_BATERIA no índice 0).
+
+    :param nodes: Lista de nós
+    :return: array('d') com a bateria de cada nó
+    """
+    return array("d", (nd.bateria if isinstance(nd, Mote) else MAX_BATERIA for nd in nodes))
+
+
+def aplicar_baterias(nodes, baterias):
+    """Copia o vetor de baterias de volta para os objetos Mote."""
+    for i, nd in enumerate(nodes):
+        if isinstance(nd, Mote):
+            nd.bateria = baterias[i]
+
+
+def selecionar_cluster_heads(baterias, porcentagem=0.1, rodada=0):
+    """
+    Equivalente vetorial de cluster.selecionar_cluster_heads.
+
+    :param baterias: Vetor de baterias (índice 0 é a Station)
+    :param porcentagem: Porcentagem de nós que serão cluster heads
+    :param rodada: Número da rodada atual
+    :return: Conjunto de índices dos cluster heads selecionados
+    """
+    motes = [i for i in range(1, len(baterias)) if baterias[i] > 0]
+
+    if not motes:
+        return set()
+
+    num_chs = max(1, int(len(motes) * porcentagem))
+
+    energia_max = max(baterias[i] for i in motes)
+    energia_media = sum(baterias[i] for i in motes) / len(motes)
+    limiar_energia = max(energia_media * 0.5, 1.0)
+
+    divisor = len(motes) // num_chs + 1
+    grupo_rodada = (rodada // num_chs) % divisor
+
+    candidatos = []
+    for i in motes:
+        b = baterias[i]
+        if b < limiar_energia:
+            continue
+        prioridade_energia = b / energia_max if energia_max > 0 else 1.0
+        bonus_rotacao = 1.0 if (i % divisor) == grupo_rodada else 0.3
+        candidatos.append((i, prioridade_energia * bonus_rotacao, b))
+
+    if len(candidatos) < num_chs:
+        candidatos = []
+        for i in motes:
+            b = baterias[i]
+            prioridade_energia = b / energia_max if energia_max > 0 else 1.0
+            candidatos.append((i, prioridade_energia, b))
+
+    candidatos.sort(key=lambda x: (-x[1], -x[2]))
+
+    return {candidatos[i][0] for i in range(min(num_chs, len(candidatos)))}
+
+
+def termo_distancia(topologia, beta):
+    """
+    Pré-calcula beta * dij para todos os pares (pode ser compartilhado entre rodadas e réplicas).
+
+    :param topologia: Topologia da rede
+    :param beta: Peso para balancear distância e energia
+    :return: array('d') com beta * distância de cada par
+    """
+    return array("d", (beta * d for d in topologia.distancias))
+
+
+def gerar_arestas(topologia, baterias, beta=0.5, cluster_heads=frozenset(), eps=0.0001, termo=None):
+    """
+    Equivalente vetorial de geraArestas + calcular_custo_com_rotacao.
+
+    :param topologia: Topologia da rede
+    :param baterias: Vetor de baterias
+    :param beta: Peso para balancear distância e energia
+    :param cluster_heads: Conjunto de índices dos cluster heads
+    :param eps: Pequeno valor para evitar divisão por zero
+    :param termo: Resultado de termo_distancia para este beta (opcional)
+    :return: Lista ordenada de arestas (u, v, custo, índice do par)
+    """
+    pares_u = topologia.pares_u
+    pares_v = topologia.pares_v
+    if termo is None:
+        termo = termo_distancia(topologia, beta)
+    complemento = 1.0 - beta
+
+    arcs = []
+    for k in range(len(termo)):
+        u = pares_u[k]
+        v = pares_v[k]
+        if u != 0 and baterias[u] <= 0:
+            continue
+        Ej = baterias[v]
+        if v != 0 and Ej <= 0:
+            continue
+
+        if v == 0:
+            custo = termo[k]
+        else:
+            custo = termo[k] + complemento * (1.0 / (Ej + eps))
+            if Ej < 10.0:
+                custo *= (1.0 + (10.0 - Ej) / 10.0)
+            if v in cluster_heads:
+                custo *= 0.7
+
+        arcs.append((u, v, custo, k))
+
+    arcs.sort(key=lambda arc: arc[2])
+    return arcs
+
+
+def _consumir(baterias, sensor, ch, dij, cluster_heads, custo_base=0.01):
+    """Equivalente vetorial de consumir_energia_com_rotacao (a Station não consome)."""
+    if sensor != 0 and baterias[sensor] > 0:
+        baterias[sensor] = max(0.0, min(baterias[sensor] - custo_base * dij * 1.0, MAX_BATERIA))
+
+    if ch != 0 and baterias[ch] > 0:
+        fator = 1.2 if ch in cluster_heads else 0.5
+        baterias[ch] = max(0.0, min(baterias[ch] - custo_base * dij * fator, MAX_BATERIA))
+
+
+def kruskal(topologia, baterias, arcs, cluster_heads):
+    """Kruskal com descarga sobre o vetor de baterias. Retorna a MST (u, v, custo)."""
+    n = topologia.n
+    distancias = topologia.distancias
+    link = list(range(n))
+    size = [1] * n
+
+    tree = []
+    for u, v, w, k in arcs:
+        a = u
+        while link[a] != a:
+            link[a] = link[link[a]]
+            a = link[a]
+        b = v
+        while link[b] != b:
+            link[b] = link[link[b]]
+            b = link[b]
+        if a == b:
+            continue
+        if size[a] < size[b]:
+            a, b = b, a
+        size[a] += size[b]
+        link[b] = a
+
+        tree.append((u, v, w))
+        _consumir(baterias, u, v, distancias[k], cluster_heads)
+
+    return tree
+
+
+def prim(topologia, baterias, arcs, cluster_heads):
+    """
+    Prim com descarga sobre o vetor de baterias. Retorna a MST (u, v, custo).
+
+    Usa heap com chave (custo, u, posição em adj[u]), que escolhe exatamente a
+    mesma aresta que a varredura completa de arvoregeradora.prim em caso de empate.
+    """
+    n = topologia.n
+    if n == 0:
+        return []
+    distancias = topologia.distancias
+
+    adj = [[] for _ in range(n)]
+    for u, v, w, k in arcs:
+        adj[u].append((v, w, k))
+        adj[v].append((u, w, k))
+
+    selecionados = [False] * n
+    selecionados[0] = True
+    heap = [(w, 0, pos, v, k) for pos, (v, w, k) in enumerate(adj[0])]
+    heapq.heapify(heap)
+
+    tree = []
+    while heap:
+        w, u, _, v, k = heapq.heappop(heap)
+        if selecionados[v]:
+            continue
+
+        tree.append((u, v, w))
+        selecionados[v] = True
+        _consumir(baterias, u, v, distancias[k], cluster_heads)
+
+        for pos, (j, peso, kj) in enumerate(adj[v]):
+            if not selecionados[j]:
+                heapq.heappush(heap, (peso, v, pos, j, kj))
+
+    return tree
+
+
+def iterar_rodadas(topologia, baterias, algoritmo="kruskal", rodadas=2000, beta=0.5, porcentagem_ch=0.1,
+                   usar_cluster_heads=True, rodada_inicial=1):
+    """
+    Executa as rodadas da simulação, alterando o vetor de baterias no local.
+
+    Após cada rodada produz (rodada, cluster_heads, tree, motes_ativos). Encerra
+    nas mesmas condições de simular_descarga_kruskal/prim.
+
+    :param topologia: Topologia da rede
+    :param baterias: Vetor de baterias (alterado no local)
+    :param algoritmo: "kruskal" ou "prim"
+    :param rodadas: Número máximo de rodadas
+    :param beta: Peso para balancear distância e energia
+    :param porcentagem_ch: Porcentagem de nós que serão cluster heads por rodada
+    :param usar_cluster_heads: Se True, usa rotação de cluster heads
+    :param rodada_inicial: Rodada em que a simulação começa
+    """
+    arvore = kruskal if algoritmo == "kruskal" else prim
+    n = topologia.n
+    termo = termo_distancia(topologia, beta)
+
+    for rodada in range(rodada_inicial, rodadas + 1):
+        if usar_cluster_heads:
+            cluster_heads = selecionar_cluster_heads(baterias, porcentagem_ch, rodada)
+        else:
+            cluster_heads = set()
+
+        arcs = gerar_arestas(topologia, baterias, beta, cluster_heads, termo=termo)
+        tree = arvore(topologia, baterias, arcs, cluster_heads)
+
+        motes_ativos = sum(1 for i in range(1, n) if baterias[i] > 0)
+
+        yield rodada, cluster_heads, tree, motes_ativos
+
+        if motes_ativos == 0 or len(tree) == 0:
+            return
+
+
+def simular_descarga(topologia, baterias, algoritmo="kruskal", rodadas=2000, beta=0.5, porcentagem_ch=0.1,
+                     usar_cluster_heads=True, rodada_inicial=1):
+    """
+    Simula a descarga sobre o vetor de baterias e retorna o número de rodadas executadas.
+
+    Parâmetros iguais a iterar_rodadas.
+    """
+    rodadas_executadas = rodada_inicial - 1
+    for rodada, _, _, _ in iterar_rodadas(topologia, baterias, algoritmo, rodadas, beta, porcentagem_ch,
+                                          usar_cluster_heads, rodada_inicial):
+        rodadas_executadas = rodada
+    return rodadas_executadas
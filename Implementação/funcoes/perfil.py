@@ -0,0 +1,179 @@
+"""
+Módulo de instrumentação das simulações.
+Mede tempo de parede, número de chamadas e itens processados por fase de cada rodada.
+"""
+
+import csv
+from time import perf_counter
+
+
+class _Medicao():
+    """Context manager que mede uma fase e registra no perfilador ao sair."""
+
+    __slots__ = ("perfilador", "nome", "inicio")
+
+    def __init__(self, perfilador, nome):
+        self.perfilador = perfilador
+        self.nome = nome
+
+    def __enter__(self):
+        self.inicio = perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self.perfilador.registrar(self.nome, perf_counter() - self.inicio)
+        return False
+
+
+class _MedicaoNula():
+    """Context manager vazio usado quando a instrumentação está desligada."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+class Perfilador():
+    """
+    Acumula tempo, chamadas e itens processados por fase e por rodada.
+
+    Uso típico dentro do laço de simulação:
+        perfil.nova_rodada(rodada)
+        with perfil.fase("geraArestas"):
+            arcs = ...
+        perfil.contar("geraArestas", len(arcs))
+    """
+
+    def __init__(self):
+        self.__totais = {}
+        self.__rodadas = []
+        self.__atual = None
+
+    def nova_rodada(self, rodada):
+        """Inicia o registro de uma nova rodada no trace."""
+        self.__atual = {}
+        self.__rodadas.append((rodada, self.__atual))
+
+    def fase(self, nome):
+        """Retorna um context manager que mede a fase informada."""
+        return _Medicao(self, nome)
+
+    def registrar(self, nome, tempo):
+        """Registra manualmente o tempo gasto em uma fase."""
+        total = self.__totais.get(nome)
+        if total is None:
+            total = self.__totais[nome] = [0.0, 0, 0]
+        total[0] += tempo
+        total[1] += 1
+
+        if self.__atual is not None:
+            registro = self.__atual.get(nome)
+            if registro is None:
+                registro = self.__atual[nome] = [0.0, 0, 0]
+            registro[0] += tempo
+            registro[1] += 1
+
+    def contar(self, nome, quantidade):
+        """Acumula itens processados (ex.: arestas) na fase informada."""
+        total = self.__totais.get(nome)
+        if total is None:
+            total = self.__totais[nome] = [0.0, 0, 0]
+        total[2] += quantidade
+
+        if self.__atual is not None:
+            registro = self.__atual.get(nome)
+            if registro is None:
+                registro = self.__atual[nome] = [0.0, 0, 0]
+            registro[2] += quantidade
+
+    @property
+    def totais(self) -> dict:
+        """Dicionário {fase: (tempo total, chamadas, itens)}."""
+        return {nome: tuple(valores) for nome, valores in self.__totais.items()}
+
+    @property
+    def rodadas(self) -> list:
+        """Lista de (rodada, {fase: (tempo, chamadas, itens)})."""
+        return [(rodada, {nome: tuple(v) for nome, v in fases.items()}) for rodada, fases in self.__rodadas]
+
+    def chamadas_por_rodada(self, nome):
+        """
+        Chamadas da fase em cada rodada em que ela apareceu.
+
+        :param nome: Nome da fase
+        :return: Tupla (rodadas com a fase, mínimo, média, máximo); zeros se a fase não aparece no trace
+        """
+        chamadas = [fases[nome][1] for _, fases in self.__rodadas if nome in fases]
+        if not chamadas:
+            return 0, 0, 0.0, 0
+        return len(chamadas), min(chamadas), sum(chamadas) / len(chamadas), max(chamadas)
+
+    def resumo(self):
+        """
+        Monta a tabela de resumo por fase.
+
+        :return: Texto da tabela com tempo total, percentual, chamadas (total e por rodada), rodadas em que a
+                 fase apareceu, tempo médio e itens
+        """
+        tempo_total = sum(v[0] for v in self.__totais.values())
+        linhas = [
+            f"{'Fase':<20} {'Tempo (s)':>12} {'%':>7} {'Chamadas':>10} {'Rodadas':>8} {'Cham./rodada':>14} "
+            f"{'Média (ms)':>12} {'Itens':>12}",
+            "-" * 103,
+        ]
+        for nome, (tempo, chamadas, itens) in sorted(self.__totais.items(), key=lambda item: -item[1][0]):
+            percentual = (tempo / tempo_total * 100.0) if tempo_total > 0 else 0.0
+            media = (tempo / chamadas * 1000.0) if chamadas > 0 else 0.0
+            rodadas, minimo, media_rodada, maximo = self.chamadas_por_rodada(nome)
+            por_rodada = f"{media_rodada:.2f}" if minimo == maximo else f"{minimo}-{maximo} ({media_rodada:.2f})"
+            linhas.append(f"{nome:<20} {tempo:>12.4f} {percentual:>6.1f}% {chamadas:>10} {rodadas:>8} "
+                          f"{por_rodada:>14} {media:>12.4f} {itens:>12}")
+        linhas.append("-" * 103)
+        linhas.append(f"{'Total':<20} {tempo_total:>12.4f}")
+        return "\n".join(linhas)
+
+    def exibir_resumo(self, titulo="PERFIL DA SIMULAÇÃO"):
+        print("\n" + "=" * 103)
+        print(titulo)
+        print("=" * 103)
+        print(self.resumo())
+        print("=" * 103)
+
+    def exportar_trace(self, caminho):
+        """
+        Exporta o trace por rodada em CSV (rodada, fase, tempo_s, chamadas, itens).
+
+        :param caminho: Caminho do arquivo CSV
+        """
+        with open(caminho, "w", newline="") as arquivo:
+            escritor = csv.writer(arquivo)
+            escritor.writerow(["rodada", "fase", "tempo_s", "chamadas", "itens"])
+            for rodada, fases in self.__rodadas:
+                for nome, (tempo, chamadas, itens) in fases.items():
+                    escritor.writerow([rodada, nome, f"{tempo:.9f}", chamadas, itens])
+
+
+class PerfiladorNulo():
+    """Perfilador desligado: todas as operações são vazias."""
+
+    __MEDICAO = _MedicaoNula()
+
+    def nova_rodada(self, rodada):
+        pass
+
+    def fase(self, nome):
+        return self.__MEDICAO
+
+    def registrar(self, nome, tempo):
+        pass
+
+    def contar(self, nome, quantidade):
+        pass
+
+
+# Instância compartilhada usada quando nenhum perfilador é informado
+PERFILADOR_NULO = PerfiladorNulo()
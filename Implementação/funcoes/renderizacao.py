@@ -0,0 +1,220 @@
+"""
+Renderização rápida de redes grandes em PNG, sem dependências externas.
+Rasteriza nós, arestas (em alcance ou da árvore), cluster heads e um mapa de cores
+de bateria diretamente em um buffer RGB, e grava PNG com zlib (funciona sem display).
+"""
+
+import os
+import struct
+import zlib
+
+from . import motor
+from .node import Mote, MAX_BATERIA
+
+FUNDO = (255, 255, 255)
+COR_ARESTA = (190, 190, 190)
+COR_STATION = (30, 60, 200)
+COR_CLUSTER_HEAD = (0, 0, 0)
+COR_SEM_BATERIA = (120, 120, 120)
+
+
+def cor_bateria(fracao):
+    """
+    Mapa de cores da bateria: vermelho (vazia) -> amarelo -> verde (cheia).
+
+    :param fracao: Bateria normalizada entre 0 e 1
+    :return: Tupla (r, g, b)
+    """
+    fracao = max(0.0, min(1.0, fracao))
+    if fracao < 0.5:
+        return (220, int(440 * fracao), 40)
+    return (int(220 * (2.0 - 2.0 * fracao)), 200, 40)
+
+
+class Tela():
+    """Buffer RGB com primitivas de desenho e gravação em PNG."""
+
+    def __init__(self, largura, altura, fundo=FUNDO):
+        self.__largura = largura
+        self.__altura = altura
+        self.__buffer = bytearray(bytes(fundo) * (largura * altura))
+
+    @property
+    def largura(self) -> int:
+        return self.__largura
+
+    @property
+    def altura(self) -> int:
+        return self.__altura
+
+    @property
+    def buffer(self) -> bytearray:
+        return self.__buffer
+
+    def quadrado(self, x, y, raio, cor):
+        """Preenche um quadrado centrado em (x, y), uma fatia de buffer por linha."""
+        x0 = max(0, x - raio)
+        x1 = min(self.__largura, x + raio + 1)
+        if x0 >= x1:
+            return
+        faixa = bytes(cor) * (x1 - x0)
+        for yy in range(max(0, y - raio), min(self.__altura, y + raio + 1)):
+            inicio = (yy * self.__largura + x0) * 3
+            self.__buffer[inicio:inicio + len(faixa)] = faixa
+
+    def contorno(self, x, y, raio, cor):
+        """Desenha o contorno de um quadrado centrado em (x, y)."""
+        for xx in range(x - raio, x + raio + 1):
+            self.pixel(xx, y - raio, cor)
+            self.pixel(xx, y + raio, cor)
+        for yy in range(y - raio, y + raio + 1):
+            self.pixel(x - raio, yy, cor)
+            self.pixel(x + raio, yy, cor)
+
+    def pixel(self, x, y, cor):
+        if 0 <= x < self.__largura and 0 <= y < self.__altura:
+            i = (y * self.__largura + x) * 3
+            self.__buffer[i:i + 3] = bytes(cor)
+
+    def linha(self, x0, y0, x1, y1, cor):
+        """Desenha uma linha com o algoritmo de Bresenham."""
+        buffer = self.__buffer
+        largura = self.__largura
+        altura = self.__altura
+        r, g, b = cor
+
+        dx = abs(x1 - x0)
+        dy = -abs(y1 - y0)
+        sx = 1 if x0 < x1 else -1
+        sy = 1 if y0 < y1 else -1
+        erro = dx + dy
+
+        while True:
+            if 0 <= x0 < largura and 0 <= y0 < altura:
+                i = (y0 * largura + x0) * 3
+                buffer[i] = r
+                buffer[i + 1] = g
+                buffer[i + 2] = b
+            if x0 == x1 and y0 == y1:
+                break
+            e2 = 2 * erro
+            if e2 >= dy:
+                erro += dy
+                x0 += sx
+            if e2 <= dx:
+                erro += dx
+                y0 += sy
+
+    def salvar_png(self, caminho):
+        """Grava o buffer como PNG RGB de 8 bits."""
+        largura = self.__largura
+        passo = largura * 3
+        linhas = bytearray()
+        for y in range(self.__altura):
+            linhas.append(0)  # filtro "None"
+            linhas += self.__buffer[y * passo:(y + 1) * passo]
+
+        def bloco(tipo, dados):
+            corpo = tipo + dados
+            return struct.pack(">I", len(dados)) + corpo + struct.pack(">I", zlib.crc32(corpo) & 0xFFFFFFFF)
+
+        with open(caminho, "wb") as arquivo:
+            arquivo.write(b"\x89PNG\r\n\x1a\n")
+            arquivo.write(bloco(b"IHDR", struct.pack(">IIBBBBB", largura, self.__altura, 8, 2, 0, 0, 0)))
+            arquivo.write(bloco(b"IDAT", zlib.compress(bytes(linhas), 6)))
+            arquivo.write(bloco(b"IEND", b""))
+
+
+def renderizar_rede(nodes, arestas=None, cluster_heads=None, largura=800, altura=800, margem=10,
+                    raio_no=2, max_arestas=None):
+    """
+    Desenha a rede: arestas, motes coloridos pela bateria, cluster heads e Station.
+
+    Se houver mais arestas do que max_arestas (padrão: número de pixels), apenas
+    uma amostra regular delas é desenhada.
+
+    :param nodes: Lista de nós da rede
+    :param arestas: Arestas (u, v, ...) a desenhar, ex.: a árvore da rodada (opcional)
+    :param cluster_heads: Conjunto de IDs dos cluster heads (opcional)
+    :param largura: Largura da imagem em pixels
+    :param altura: Altura da imagem em pixels
+    :param margem: Margem em pixels
+    :param raio_no: Meia largura do quadrado de cada nó
+    :param max_arestas: Máximo de arestas desenhadas antes de decimar
+    :return: Tela com a imagem
+    """
+    tela = Tela(largura, altura)
+    if not nodes:
+        return tela
+
+    x_min = min(nd.x for nd in nodes)
+    x_max = max(nd.x for nd in nodes)
+    y_min = min(nd.y for nd in nodes)
+    y_max = max(nd.y for nd in nodes)
+    escala = min((largura - 2 * margem) / max(x_max - x_min, 1e-9), (altura - 2 * margem) / max(y_max - y_min, 1e-9))
+
+    # Coordenadas em pixels (eixo y invertido para a origem ficar embaixo)
+    px = [int(margem + (nd.x - x_min) * escala) for nd in nodes]
+    py = [int(altura - 1 - margem - (nd.y - y_min) * escala) for nd in nodes]
+
+    if arestas:
+        if max_arestas is None:
+            max_arestas = largura * altura
+        passo = max(1, -(-len(arestas) // max_arestas))
+        for k in range(0, len(arestas), passo):
+            u, v = arestas[k][0], arestas[k][1]
+            tela.linha(px[u], py[u], px[v], py[v], COR_ARESTA)
+
+    if cluster_heads is None:
+        cluster_heads = ()
+
+    for i, nd in enumerate(nodes):
+        if isinstance(nd, Mote):
+            cor = cor_bateria(nd.bateria / MAX_BATERIA) if nd.bateria > 0 else COR_SEM_BATERIA
+            tela.quadrado(px[i], py[i], raio_no, cor)
+            if nd.id in cluster_heads:
+                tela.contorno(px[i], py[i], raio_no + 2, COR_CLUSTER_HEAD)
+        else:
+            tela.quadrado(px[i], py[i], raio_no + 3, COR_STATION)
+
+    return tela
+
+
+def arestas_em_alcance(nodes):
+    """
+    Lista os pares de nós dentro do raio de comunicação (via grade espacial).
+
+    :param nodes: Lista de nós da rede
+    :return: Lista de arestas (u, v)
+    """
+    topologia = motor.construir_topologia(nodes)
+    return list(zip(topologia.pares_u, topologia.pares_v))
+
+
+class GravadorQuadros():
+    """
+    Grava um PNG a cada `intervalo` rodadas durante a simulação.
+
+    Pode ser passado como exportador para simular_descarga_kruskal/prim.
+    """
+
+    def __init__(self, diretorio, intervalo=10, largura=800, altura=800, prefixo="quadro"):
+        os.makedirs(diretorio, exist_ok=True)
+        self.__diretorio = diretorio
+        self.__intervalo = intervalo
+        self.__largura = largura
+        self.__altura = altura
+        self.__prefixo = prefixo
+        self.__arquivos = []
+
+    @property
+    def arquivos(self) -> list:
+        return list(self.__arquivos)
+
+    def registrar(self, rodada, nodes, tree, cluster_heads=None):
+        if rodada != 1 and rodada % self.__intervalo != 0:
+            return
+        tela = renderizar_rede(nodes, tree, cluster_heads, self.__largura, self.__altura)
+        caminho = os.path.join(self.__diretorio, f"{self.__prefixo}_{rodada:05d}.png")
+        tela.salvar_png(caminho)
+        self.__arquivos.append(caminho)
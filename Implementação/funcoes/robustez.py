@@ -0,0 +1,166 @@
+"""
+Módulo de análise probabilística de robustez.
+Estima, por Monte Carlo, a fração de motes que continuam conectados à Station após k falhas aleatórias.
+"""
+
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from .arvoregeradora import unionfind_init
+from .conectividade import construir_grafo_adj
+from .node import Mote
+
+# Tentativas por lote: cada lote tem semente própria, o que torna o resultado
+# independente do número de processos usados
+TAMANHO_LOTE = 500
+
+# Estado de cada processo de trabalho (preenchido no inicializador)
+_adj_processo = None
+_motes_processo = None
+
+
+def _raiz(link, x):
+    """Versão iterativa de find com compressão por divisão de caminho (mais rápida no laço interno)."""
+    while link[x] != x:
+        link[x] = link[link[x]]
+        x = link[x]
+    return x
+
+
+def _unir(link, size, a, b):
+    a = _raiz(link, a)
+    b = _raiz(link, b)
+    if a == b:
+        return
+    if size[a] < size[b]:
+        a, b = b, a
+    size[a] += size[b]
+    link[b] = a
+
+
+def _executar_lote(adj, motes, ks, tentativas, semente):
+    """
+    Executa um lote de tentativas e acumula soma e soma dos quadrados por k.
+
+    Em cada tentativa sorteia uma ordem de falha dos motes e reinsere os motes
+    na ordem inversa (percolação de Newman-Ziff), de forma que um único passe
+    de Union-Find fornece o resultado para todos os valores de k.
+    """
+    rng = random.Random(semente)
+    n = len(adj)
+    total = len(motes)
+    indice_k = {k: i for i, k in enumerate(ks)}
+    soma = [0.0] * len(ks)
+    soma_quadrados = [0.0] * len(ks)
+
+    for _ in range(tentativas):
+        ordem = motes[:]
+        rng.shuffle(ordem)
+
+        link, size = unionfind_init(n)
+        presente = [False] * n
+        presente[0] = True
+
+        # Após inserir ordem[pos], os motes ordem[:pos] continuam falhos (k = pos)
+        for pos in range(total - 1, -1, -1):
+            u = ordem[pos]
+            presente[u] = True
+            for v in adj[u]:
+                if presente[v]:
+                    _unir(link, size, u, v)
+
+            i = indice_k.get(pos)
+            if i is not None:
+                fracao = (size[_raiz(link, 0)] - 1) / (total - pos)
+                soma[i] += fracao
+                soma_quadrados[i] += fracao * fracao
+
+    return soma, soma_quadrados
+
+
+def _inicializar_processo(adj_lista, motes):
+    """Recebe a adjacência e os motes uma única vez por processo, e não a cada lote."""
+    global _adj_processo, _motes_processo
+    _adj_processo = adj_lista
+    _motes_processo = motes
+
+
+def _executar_lote_no_processo(ks, tentativas, semente):
+    """Versão de _executar_lote para os processos de trabalho, sobre a adjacência do inicializador."""
+    return _executar_lote(_adj_processo, _motes_processo, ks, tentativas, semente)
+
+
+def analisar_robustez_monte_carlo(nodes, ks, tentativas=1000, semente=0, processos=1, adj=None):
+    """
+    Estima a fração esperada de motes sobreviventes ainda conectados à Station
+    após k falhas aleatórias de motes, para cada k informado.
+
+    :param nodes: Lista de nós da rede
+    :param ks: Valores de k (número de motes que falham) a avaliar
+    :param tentativas: Número de tentativas de Monte Carlo
+    :param semente: Semente para reprodutibilidade
+    :param processos: Número de processos (1 executa no processo atual)
+    :param adj: Lista de adjacência pré-calculada (opcional)
+    :return: Dicionário {k: {"media": ..., "desvio": ...}}
+    """
+    if adj is None:
+        adj = construir_grafo_adj(nodes)
+
+    motes = [i for i, n in enumerate(nodes) if isinstance(n, Mote)]
+    ks = sorted(set(ks))
+    for k in ks:
+        if not 0 <= k < len(motes):
+            raise ValueError(f"k deve estar entre 0 e {len(motes) - 1}: {k}")
+
+    # Divide as tentativas em lotes com sementes derivadas da semente principal
+    rng = random.Random(semente)
+    lotes = []
+    restantes = tentativas
+    while restantes > 0:
+        quantidade = min(TAMANHO_LOTE, restantes)
+        lotes.append((quantidade, rng.getrandbits(64)))
+        restantes -= quantidade
+
+    adj_lista = [adj[i] for i in range(len(nodes))]
+
+    if processos > 1:
+        with ProcessPoolExecutor(max_workers=processos, initializer=_inicializar_processo,
+                                 initargs=(adj_lista, motes)) as executor:
+            futuros = [executor.submit(_executar_lote_no_processo, ks, q, s) for q, s in lotes]
+            parciais = [f.result() for f in futuros]
+    else:
+        parciais = [_executar_lote(adj_lista, motes, ks, q, s) for q, s in lotes]
+
+    resultado = {}
+    for i, k in enumerate(ks):
+        soma = sum(p[0][i] for p in parciais)
+        soma_quadrados = sum(p[1][i] for p in parciais)
+        media = soma / tentativas
+        variancia = max(0.0, soma_quadrados / tentativas - media * media)
+        resultado[k] = {"media": media, "desvio": math.sqrt(variancia)}
+
+    return resultado
+
+
+def exibir_relatorio_monte_carlo(nodes, ks, tentativas=1000, semente=0, processos=1, adj=None):
+    """
+    Exibe a robustez estimada por analisar_robustez_monte_carlo para cada k.
+
+    :param adj: Lista de adjacência pré-calculada (opcional, ex.: do cache)
+    :return: Dicionário retornado por analisar_robustez_monte_carlo
+    """
+    print("\n" + "=" * 80)
+    print("ANÁLISE PROBABILÍSTICA DE ROBUSTEZ (MONTE CARLO)")
+    print("=" * 80)
+    print(f"Tentativas por valor de k: {tentativas}")
+
+    resultado = analisar_robustez_monte_carlo(nodes, ks, tentativas, semente, processos, adj)
+
+    print(f"\n{'Falhas (k)':>12} {'Conectados (média)':>20} {'Desvio padrão':>16}")
+    print("-" * 80)
+    for k, estatisticas in resultado.items():
+        print(f"{k:>12} {estatisticas['media'] * 100:>19.2f}% {estatisticas['desvio'] * 100:>15.2f}%")
+    print("=" * 80 + "\n")
+
+    return resultado
@@ -0,0 +1,505 @@
+"""
+Serviço local de trabalhos de simulação e robustez.
+Front-end asyncio (socket Unix ou TCP, uma mensagem JSON por linha) e back-end com
+um pool de processos que mantém instâncias e topologias carregadas entre trabalhos.
+O progresso por rodada é transmitido ao cliente, e os resultados ficam em um banco
+SQLite: um trabalho repetido (mesma instância e mesmos parâmetros) é respondido
+direto do banco, sem carregar nem simular nada.
+
+Execute com: python -m funcoes.servico [caminho_do_socket | porta]
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import multiprocessing
+import os
+import signal
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.managers import SyncManager
+
+from . import leitura as l
+from . import motor
+from . import robustez
+from .cache import CacheInstancias, DIR_CACHE, chave_instancia
+from .main import listar_arquivos_rede
+from .node import Mote
+
+PORTA_PADRAO = 8765
+BANCO_PADRAO = os.path.join(DIR_CACHE, "resultados.sqlite3")
+
+# Espera máxima pelo fim do progresso de um trabalho que terminou sem enviá-lo (processo encerrado à força)
+ESPERA_FIM_PROGRESSO = 5.0
+
+PADROES = {
+    "simulacao": {
+        "algoritmo": "kruskal",
+        "rodadas": 2000,
+        "beta": 0.5,
+        "porcentagem_ch": 0.1,
+        "usar_cluster_heads": True,
+    },
+    "robustez": {
+        "ks": [1, 2, 5, 10],
+        "tentativas": 1000,
+        "semente": 0,
+    },
+}
+
+# Estado de cada processo de trabalho (preenchido no inicializador)
+_fila_progresso = None
+_instancias_processo = {}
+
+
+class PedidoInvalido(ValueError):
+    """Pedido rejeitado antes de entrar na fila; campo indica o parâmetro com problema (ou None)."""
+
+    def __init__(self, mensagem, campo=None):
+        super().__init__(mensagem)
+        self.campo = campo
+
+    def evento(self):
+        """Evento de erro estruturado enviado ao cliente."""
+        return {"evento": "erro", "codigo": "pedido_invalido", "campo": self.campo, "mensagem": str(self)}
+
+
+def _inteiro(valor, campo, minimo):
+    # bool é subclasse de int, mas true/false não são números válidos aqui
+    if isinstance(valor, bool) or not isinstance(valor, int):
+        raise PedidoInvalido(f"{campo} deve ser um inteiro: {valor!r}", campo)
+    if valor < minimo:
+        raise PedidoInvalido(f"{campo} deve ser pelo menos {minimo}: {valor}", campo)
+    return valor
+
+
+def _real(valor, campo, minimo, maximo, incluir_minimo=True):
+    if isinstance(valor, bool) or not isinstance(valor, (int, float)) or not math.isfinite(valor):
+        raise PedidoInvalido(f"{campo} deve ser um número: {valor!r}", campo)
+    if valor > maximo or valor < minimo or (valor == minimo and not incluir_minimo):
+        intervalo = f"{'[' if incluir_minimo else '('}{minimo}, {maximo}]"
+        raise PedidoInvalido(f"{campo} deve estar em {intervalo}: {valor}", campo)
+    return float(valor)
+
+
+def _numero_motes(instancia):
+    """Número de motes declarado na primeira linha da instância."""
+    with open(os.path.join(l.DATA_DIR, instancia), "r") as arquivo:
+        return int(arquivo.readline().strip())
+
+
+def normalizar_pedido(pedido):
+    """
+    Valida um pedido e completa os parâmetros ausentes com os padrões.
+
+    Tipos e intervalos são conferidos aqui, antes de o trabalho entrar na fila,
+    e números reais são convertidos para float (beta 1 e 1.0 geram a mesma chave).
+
+    :param pedido: Dicionário com tipo, instancia e parâmetros do trabalho
+    :return: Dicionário normalizado (só com os campos que afetam o resultado)
+    :raises PedidoInvalido: Se algum campo tiver tipo ou valor inválido
+    """
+    if not isinstance(pedido, dict):
+        raise PedidoInvalido("O pedido deve ser um objeto JSON")
+    tipo = pedido.get("tipo")
+    if tipo not in PADROES:
+        raise PedidoInvalido(f"Tipo de trabalho desconhecido: {tipo}", "tipo")
+    instancia = pedido.get("instancia")
+    if not isinstance(instancia, str) or instancia not in listar_arquivos_rede():
+        raise PedidoInvalido(f"Instância não encontrada: {instancia}", "instancia")
+
+    normalizado = {"tipo": tipo, "instancia": instancia}
+    for campo, padrao in PADROES[tipo].items():
+        normalizado[campo] = pedido.get(campo, padrao)
+
+    if tipo == "simulacao":
+        if normalizado["algoritmo"] not in ("kruskal", "prim"):
+            raise PedidoInvalido(f"Algoritmo desconhecido: {normalizado['algoritmo']}", "algoritmo")
+        _inteiro(normalizado["rodadas"], "rodadas", 1)
+        normalizado["beta"] = _real(normalizado["beta"], "beta", 0.0, 1.0)
+        normalizado["porcentagem_ch"] = _real(normalizado["porcentagem_ch"], "porcentagem_ch", 0.0, 1.0,
+                                              incluir_minimo=False)
+        if not isinstance(normalizado["usar_cluster_heads"], bool):
+            raise PedidoInvalido(f"usar_cluster_heads deve ser true ou false: {normalizado['usar_cluster_heads']!r}",
+                                 "usar_cluster_heads")
+    else:
+        ks = normalizado["ks"]
+        if not isinstance(ks, list) or not ks:
+            raise PedidoInvalido(f"ks deve ser uma lista não vazia de inteiros: {ks!r}", "ks")
+        total_motes = _numero_motes(instancia)
+        for k in ks:
+            _inteiro(k, "ks", 0)
+            if k >= total_motes:
+                raise PedidoInvalido(f"k deve estar entre 0 e {total_motes - 1}: {k}", "ks")
+        normalizado["ks"] = sorted(set(ks))
+        _inteiro(normalizado["tentativas"], "tentativas", 1)
+        _inteiro(normalizado["semente"], "semente", 0)
+
+    _inteiro(pedido.get("intervalo_progresso", 0), "intervalo_progresso", 0)
+    return normalizado
+
+
+def chave_trabalho(normalizado):
+    """Identificador do trabalho: hash do conteúdo da instância e dos parâmetros."""
+    parametros = dict(normalizado)
+    parametros["instancia"] = chave_instancia(normalizado["instancia"])
+    return hashlib.sha256(json.dumps(parametros, sort_keys=True).encode()).hexdigest()
+
+
+# =============================================================================
+# BACK-END: PROCESSOS DE TRABALHO
+# =============================================================================
+
+def _ignorar_interrupcao():
+    """Ctrl+C é tratado só pelo servidor, que encerra os processos em ordem."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _inicializar_processo(fila):
+    global _fila_progresso
+    _ignorar_interrupcao()
+    _fila_progresso = fila
+
+
+def _carregar(instancia):
+    """
+    Retorna (nodes, entrada do cache) da instância, mantidos em memória entre trabalhos.
+
+    A cópia em memória é conferida pelo hash do conteúdo (chave_instancia): se o
+    arquivo mudou desde o último trabalho, a instância é lida de novo.
+    """
+    chave = chave_instancia(instancia)
+    carregada = _instancias_processo.get(instancia)
+    if carregada is None or carregada[0] != chave:
+        nodes = l.leitura(instancia)
+        carregada = (chave, nodes, CacheInstancias().obter(instancia, nodes))
+        _instancias_processo[instancia] = carregada
+    return carregada[1], carregada[2]
+
+
+def _executar_simulacao(chave, parametros, intervalo_progresso):
+    nodes, entrada = _carregar(parametros["instancia"])
+    topologia = entrada.topologia()
+    baterias = motor.baterias_de_nodes(nodes)
+    n = topologia.n
+
+    rodadas_executadas = 0
+    for rodada, _, tree, motes_ativos in motor.iterar_rodadas(topologia, baterias, parametros["algoritmo"],
+                                                             parametros["rodadas"], parametros["beta"],
+                                                             parametros["porcentagem_ch"],
+                                                             parametros["usar_cluster_heads"]):
+        rodadas_executadas = rodada
+        if intervalo_progresso and rodada % intervalo_progresso == 0:
+            _fila_progresso.put((chave, {"rodada": rodada, "motes_ativos": motes_ativos,
+                                         "arestas": len(tree), "bateria": sum(baterias[i] for i in range(1, n))}))
+
+    return {
+        "rodadas": rodadas_executadas,
+        "motes_ativos": sum(1 for i in range(1, n) if baterias[i] > 0),
+        "bateria_final": sum(baterias[i] for i in range(1, n)),
+    }
+
+
+def _executar_robustez(chave, parametros, intervalo_progresso):
+    nodes, entrada = _carregar(parametros["instancia"])
+    _fila_progresso.put((chave, {"etapa": "monte_carlo"}))
+    monte_carlo = robustez.analisar_robustez_monte_carlo(nodes, parametros["ks"], parametros["tentativas"],
+                                                         parametros["semente"], processos=1,
+                                                         adj=entrada.adjacencia())
+    return {
+        "total_motes": sum(1 for nd in nodes if isinstance(nd, Mote)),
+        "criticos_simulacao": entrada.criticos_simulacao,
+        "criticos_dfs": entrada.criticos_dfs,
+        "monte_carlo": {str(k): valor for k, valor in monte_carlo.items()},
+    }
+
+
+_EXECUTORES = {
+    "simulacao": _executar_simulacao,
+    "robustez": _executar_robustez,
+}
+
+
+def _executar(chave, parametros, intervalo_progresso):
+    try:
+        return _EXECUTORES[parametros["tipo"]](chave, parametros, intervalo_progresso)
+    finally:
+        # Marca o fim do progresso: o servidor só publica o resultado depois de repassar tudo até aqui
+        _fila_progresso.put((chave, None))
+
+
+# =============================================================================
+# FRONT-END: SERVIDOR ASYNCIO
+# =============================================================================
+
+class ServicoSimulacao():
+    """
+    Servidor de trabalhos com pool de processos e armazenamento em SQLite.
+
+    Protocolo: o cliente envia um pedido JSON por linha, ex.:
+    {"tipo": "simulacao", "instancia": "rede50.txt", "algoritmo": "prim", "intervalo_progresso": 10}
+    {"tipo": "robustez", "instancia": "rede100.txt", "ks": [1, 5], "tentativas": 500}
+    e recebe eventos "aceito", "progresso" (zero ou mais) e "concluido" (ou "erro").
+    {"tipo": "resultado", "id": ...} consulta um trabalho pelo id recebido em "aceito"
+    e recebe "concluido", "pendente" ou "erro".
+    """
+
+    def __init__(self, caminho_banco=BANCO_PADRAO, processos=2):
+        os.makedirs(os.path.dirname(os.path.abspath(caminho_banco)), exist_ok=True)
+        self.__banco = sqlite3.connect(caminho_banco)
+        self.__banco.execute(
+            "CREATE TABLE IF NOT EXISTS trabalhos ("
+            "chave TEXT PRIMARY KEY, tipo TEXT, parametros TEXT, resultado TEXT, duracao REAL, criado REAL)"
+        )
+        self.__banco.commit()
+
+        # "spawn" evita que os processos herdem os sockets abertos pelo servidor
+        contexto = multiprocessing.get_context("spawn")
+        self.__gerenciador = SyncManager(ctx=contexto)
+        self.__gerenciador.start(_ignorar_interrupcao)
+        self.__fila = self.__gerenciador.Queue()
+        self.__executor = ProcessPoolExecutor(max_workers=processos, mp_context=contexto,
+                                              initializer=_inicializar_processo, initargs=(self.__fila,))
+        self.__em_andamento = {}
+        self.__assinantes = {}
+        self.__fim_progresso = {}
+        self.__laco = None
+        self.__leitor = None
+
+    # --- armazenamento ---
+
+    def resultado_salvo(self, chave):
+        """Retorna o resultado armazenado do trabalho, ou None."""
+        linha = self.__banco.execute("SELECT resultado FROM trabalhos WHERE chave = ?", (chave,)).fetchone()
+        return json.loads(linha[0]) if linha else None
+
+    def __salvar(self, chave, parametros, resultado, duracao):
+        self.__banco.execute("INSERT OR REPLACE INTO trabalhos VALUES (?, ?, ?, ?, ?, ?)",
+                             (chave, parametros["tipo"], json.dumps(parametros), json.dumps(resultado),
+                              duracao, time.time()))
+        self.__banco.commit()
+
+    # --- progresso vindo dos processos ---
+
+    def __repassar_progresso(self):
+        """Thread que lê a fila dos processos e entrega o progresso ao laço de eventos."""
+        while True:
+            try:
+                mensagem = self.__fila.get()
+            except (EOFError, OSError):
+                return
+            if mensagem is None:
+                return
+            chave, dados = mensagem
+            if dados is None:
+                self.__laco.call_soon_threadsafe(self.__encerrar_progresso, chave)
+            else:
+                self.__laco.call_soon_threadsafe(self.__publicar, chave, {"evento": "progresso", "id": chave, **dados})
+
+    def __publicar(self, chave, evento):
+        for fila in self.__assinantes.get(chave, ()):
+            fila.put_nowait(evento)
+
+    def __encerrar_progresso(self, chave):
+        # Chamado depois de todos os eventos de progresso já repassados para a chave
+        fim = self.__fim_progresso.get(chave)
+        if fim is not None and not fim.done():
+            fim.set_result(None)
+
+    # --- trabalhos ---
+
+    async def __rodar(self, chave, parametros, intervalo_progresso):
+        inicio = time.perf_counter()
+        fim_progresso = self.__laco.create_future()
+        self.__fim_progresso[chave] = fim_progresso
+        try:
+            try:
+                resultado = await self.__laco.run_in_executor(self.__executor, _executar, chave, parametros,
+                                                              intervalo_progresso)
+            finally:
+                # O resultado chega pelo executor e o progresso pela fila: espera a fila chegar ao fim do trabalho
+                await asyncio.wait({fim_progresso}, timeout=ESPERA_FIM_PROGRESSO)
+        except Exception as erro:
+            self.__publicar(chave, {"evento": "erro", "id": chave, "mensagem": str(erro)})
+        else:
+            self.__salvar(chave, parametros, resultado, time.perf_counter() - inicio)
+            self.__publicar(chave, {"evento": "concluido", "id": chave, "resultado": resultado, "armazenado": False})
+        finally:
+            self.__fim_progresso.pop(chave, None)
+            self.__em_andamento.pop(chave, None)
+
+    async def __consultar_resultado(self, pedido, enviar):
+        """Responde a {"tipo": "resultado", "id": ...} sem executar nada."""
+        chave = pedido.get("id")
+        if not isinstance(chave, str):
+            await enviar(PedidoInvalido(f"id deve ser uma string: {chave!r}", "id").evento())
+            return
+
+        resultado = self.resultado_salvo(chave)
+        if resultado is not None:
+            await enviar({"evento": "concluido", "id": chave, "resultado": resultado, "armazenado": True})
+        elif chave in self.__em_andamento:
+            await enviar({"evento": "pendente", "id": chave})
+        else:
+            await enviar({"evento": "erro", "codigo": "nao_encontrado", "id": chave,
+                          "mensagem": f"Nenhum trabalho com id {chave}"})
+
+    async def __atender_pedido(self, pedido, enviar):
+        if isinstance(pedido, dict) and pedido.get("tipo") == "resultado":
+            await self.__consultar_resultado(pedido, enviar)
+            return
+
+        try:
+            parametros = normalizar_pedido(pedido)
+        except PedidoInvalido as erro:
+            await enviar(erro.evento())
+            return
+
+        chave = chave_trabalho(parametros)
+        await enviar({"evento": "aceito", "id": chave})
+
+        resultado = self.resultado_salvo(chave)
+        if resultado is not None:
+            await enviar({"evento": "concluido", "id": chave, "resultado": resultado, "armazenado": True})
+            return
+
+        # Pedidos iguais em andamento compartilham a mesma execução e o mesmo progresso
+        fila = asyncio.Queue()
+        self.__assinantes.setdefault(chave, []).append(fila)
+        if chave not in self.__em_andamento:
+            self.__em_andamento[chave] = asyncio.ensure_future(
+                self.__rodar(chave, parametros, pedido.get("intervalo_progresso", 0)))
+
+        try:
+            while True:
+                evento = await fila.get()
+                await enviar(evento)
+                if evento["evento"] != "progresso":
+                    return
+        finally:
+            self.__assinantes[chave].remove(fila)
+            if not self.__assinantes[chave]:
+                del self.__assinantes[chave]
+
+    async def __atender_conexao(self, leitor, escritor):
+        async def enviar(evento):
+            escritor.write(json.dumps(evento).encode() + b"\n")
+            await escritor.drain()
+
+        try:
+            while True:
+                linha = await leitor.readline()
+                if not linha:
+                    break
+                try:
+                    pedido = json.loads(linha)
+                except json.JSONDecodeError:
+                    await enviar({"evento": "erro", "codigo": "json_invalido", "campo": None,
+                                  "mensagem": "Pedido não é um JSON válido"})
+                    continue
+                await self.__atender_pedido(pedido, enviar)
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+
+    async def servir(self, caminho_socket=None, host="127.0.0.1", porta=PORTA_PADRAO, pronto=None):
+        """
+        Atende conexões até ser cancelado.
+
+        :param caminho_socket: Caminho do socket Unix (se None, usa TCP em host:porta)
+        :param host: Endereço TCP
+        :param porta: Porta TCP
+        :param pronto: asyncio.Event sinalizado quando o servidor começa a aceitar conexões (opcional)
+        """
+        self.__laco = asyncio.get_running_loop()
+        self.__leitor = threading.Thread(target=self.__repassar_progresso, daemon=True)
+        self.__leitor.start()
+
+        if caminho_socket is not None:
+            if os.path.exists(caminho_socket):
+                os.remove(caminho_socket)
+            servidor = await asyncio.start_unix_server(self.__atender_conexao, path=caminho_socket)
+        else:
+            servidor = await asyncio.start_server(self.__atender_conexao, host, porta)
+
+        async with servidor:
+            if pronto is not None:
+                pronto.set()
+            try:
+                await servidor.serve_forever()
+            finally:
+                if caminho_socket is not None and os.path.exists(caminho_socket):
+                    os.remove(caminho_socket)
+
+    def fechar(self):
+        """Encerra o pool de processos, a thread de progresso e o banco."""
+        self.__executor.shutdown()
+        self.__fila.put(None)
+        if self.__leitor is not None:
+            self.__leitor.join()
+        self.__gerenciador.shutdown()
+        self.__banco.close()
+
+
+# =============================================================================
+# CLIENTE
+# =============================================================================
+
+async def enviar_trabalho(pedido, caminho_socket=None, host="127.0.0.1", porta=PORTA_PADRAO, ao_progresso=None):
+    """
+    Envia um pedido ao serviço e aguarda o resultado.
+
+    :param pedido: Dicionário do pedido (ver ServicoSimulacao)
+    :param caminho_socket: Caminho do socket Unix (se None, usa TCP em host:porta)
+    :param host: Endereço TCP
+    :param porta: Porta TCP
+    :param ao_progresso: Função chamada com cada evento de progresso (opcional)
+    :return: Evento final ("concluido" ou "erro")
+    """
+    if caminho_socket is not None:
+        leitor, escritor = await asyncio.open_unix_connection(caminho_socket)
+    else:
+        leitor, escritor = await asyncio.open_connection(host, porta)
+
+    try:
+        escritor.write(json.dumps(pedido).encode() + b"\n")
+        await escritor.drain()
+        while True:
+            linha = await leitor.readline()
+            if not linha:
+                raise ConnectionError("Conexão encerrada pelo serviço")
+            evento = json.loads(linha)
+            if evento["evento"] == "progresso":
+                if ao_progresso is not None:
+                    ao_progresso(evento)
+            elif evento["evento"] != "aceito":
+                return evento
+    finally:
+        escritor.close()
+        await escritor.wait_closed()
+
+
+def executar_trabalho(pedido, caminho_socket=None, host="127.0.0.1", porta=PORTA_PADRAO, ao_progresso=None):
+    """Versão síncrona de enviar_trabalho."""
+    return asyncio.run(enviar_trabalho(pedido, caminho_socket, host, porta, ao_progresso))
+
+
+if __name__ == "__main__":
+    argumento = sys.argv[1] if len(sys.argv) > 1 else str(PORTA_PADRAO)
+    servico = ServicoSimulacao()
+    try:
+        if argumento.isdigit():
+            print(f"Serviço em 127.0.0.1:{argumento}")
+            asyncio.run(servico.servir(porta=int(argumento)))
+        else:
+            print(f"Serviço em {argumento}")
+            asyncio.run(servico.servir(caminho_socket=argumento))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servico.fechar()